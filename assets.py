@@ -0,0 +1,215 @@
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:
+    # Without Pillow, logos are mirrored at their original size
+    Image = None
+
+ASSET_DIR = "asset_cache"
+
+# Thumbnails are twice the largest display size (40px) for high-DPI screens
+THUMBNAIL_SIZE = 80
+
+# Least recently used files are evicted once the mirror grows past this
+ASSET_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# Data URIs kept in memory, least recently used evicted first
+MAX_DATA_URIS = 512
+
+# Seconds to wait before retrying an image that failed to download
+RETRY_FAILED_AFTER = 10 * 60
+
+# Set to False to serve remote URLs as-is and never download anything
+MIRROR_ENABLED = True
+
+# Magic bytes of the image formats logos come in, checked in order
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF8', 'image/gif'),
+    (b'<svg', 'image/svg+xml'),
+    (b'<?xml', 'image/svg+xml')
+)
+
+_data_uris = OrderedDict()
+# Rewrites image URLs before use, e.g. to a local fixture server; None keeps them as-is
+_route_url = None
+_pending = set()
+_failed = {}
+_version = 0
+_lock = threading.Lock()
+_session = requests.Session()
+_downloader = ThreadPoolExecutor(max_workers=4, thread_name_prefix="asset-mirror")
+
+
+def _asset_path(url, size):
+    """Get the mirror file path for a remote image at a thumbnail size"""
+    key = hashlib.sha1(f"{url}|{size}".encode('utf-8')).hexdigest()
+    return os.path.join(ASSET_DIR, f"{key}.png")
+
+
+def image_type(image_bytes, default='image/png'):
+    """Get an image's MIME type from its leading bytes"""
+    if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+        return 'image/webp'
+    head = image_bytes[:64].lstrip()
+    for signature, content_type in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return default
+
+
+def _to_data_uri(image_bytes):
+    # Without Pillow, mirrored images keep their original format
+    return f"data:{image_type(image_bytes)};base64," + base64.b64encode(image_bytes).decode()
+
+
+def route_urls(rewrite):
+    """Send every image URL through rewrite(url) before it is downloaded or served"""
+    global _route_url
+    _route_url = rewrite
+
+
+def make_thumbnail(image_bytes, size):
+    """Shrink an image to fit a size x size box and re-encode it as PNG"""
+    if Image is None:
+        return image_bytes
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image.thumbnail((size, size))
+        output = io.BytesIO()
+        image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+
+def _remember(path, data_uri):
+    with _lock:
+        _data_uris[path] = data_uri
+        _data_uris.move_to_end(path)
+        while len(_data_uris) > MAX_DATA_URIS:
+            _data_uris.popitem(last=False)
+
+
+def _bump_version():
+    global _version
+    with _lock:
+        _version += 1
+
+
+def mirror_version():
+    """Get a counter that changes whenever a new thumbnail is mirrored"""
+    return _version
+
+
+def evict_assets(max_bytes=ASSET_CACHE_MAX_BYTES):
+    """Delete least recently used mirror files until the mirror fits in max_bytes"""
+    if not os.path.isdir(ASSET_DIR):
+        return
+    files = []
+    for name in os.listdir(ASSET_DIR):
+        path = os.path.join(ASSET_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        with _lock:
+            _data_uris.pop(path, None)
+
+
+def _mirror(url, size, path):
+    try:
+        response = _session.get(url, timeout=10)
+        response.raise_for_status()
+        thumbnail = make_thumbnail(response.content, size)
+        os.makedirs(ASSET_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(thumbnail)
+        os.replace(tmp_path, path)
+        _remember(path, _to_data_uri(thumbnail))
+        _bump_version()
+        evict_assets()
+    except (requests.exceptions.RequestException, OSError, ValueError):
+        # Keep serving the remote URL and retry after a while
+        with _lock:
+            _failed[path] = time.monotonic() + RETRY_FAILED_AFTER
+    finally:
+        with _lock:
+            _pending.discard(path)
+
+
+def get_thumbnail(url, size=THUMBNAIL_SIZE):
+    """Get a cached thumbnail data URI for a remote image
+
+    The first request for an image returns the remote URL and mirrors the
+    image in the background, so rendering never waits on a download.
+    """
+    if url and _route_url is not None:
+        url = _route_url(url)
+    if not url or not MIRROR_ENABLED:
+        return url
+    path = _asset_path(url, size)
+
+    with _lock:
+        data_uri = _data_uris.get(path)
+        if data_uri is not None:
+            _data_uris.move_to_end(path)
+            return data_uri
+
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                data_uri = _to_data_uri(f.read())
+            # Touch the file so eviction sees it as recently used
+            os.utime(path)
+        except OSError:
+            return url
+        _remember(path, data_uri)
+        return data_uri
+
+    with _lock:
+        if path in _pending or _failed.get(path, 0) > time.monotonic():
+            return url
+        _pending.add(path)
+        _failed.pop(path, None)
+    _downloader.submit(_mirror, url, size, path)
+    return url
+
+
+def get_local_image(path, size=None):
+    """Get a data URI for a local image, thumbnailed to size if given, cached until the file changes"""
+    cache_key = f"{os.path.abspath(path)}|{os.path.getmtime(path)}|{size}"
+    with _lock:
+        data_uri = _data_uris.get(cache_key)
+    if data_uri is None:
+        with open(path, 'rb') as f:
+            image_bytes = f.read()
+        if size:
+            try:
+                image_bytes = make_thumbnail(image_bytes, size)
+            except (OSError, ValueError):
+                # Serve the original if Pillow can't read it
+                pass
+        data_uri = _to_data_uri(image_bytes)
+        _remember(cache_key, data_uri)
+    return data_uri
@@ -0,0 +1,279 @@
+"""Benchmark the data-processing layer against synthetic leagues of increasing size.
+
+    python benchmark.py                 # every size, results appended to bench_results/benchmarks.jsonl
+    python benchmark.py --sizes small   # today's 3 divisions x 6 teams only
+
+Each run appends one JSON line per (stage, size) tagged with the git commit,
+so regressions show up by comparing lines across commits.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from streamlit import logger as streamlit_logger
+
+import assets
+import utils
+
+RESULTS_FILE = os.path.join("bench_results", "benchmarks.jsonl")
+
+# (divisions, teams per division, weeks)
+SIZES = {
+    'small': [(3, 6, 18)],
+    'full': [(3, 6, 18), (10, 10, 18), (30, 12, 18), (100, 20, 18)]
+}
+
+# Lineup slots the dashboard reads: QB, K, P
+ROSTER_SLOTS = [0, 0, 17, 17, 18]
+
+# Simulated seasons per playoff-odds call; the cost is linear in trials, so a
+# slice of the app's PLAYOFF_SIM_TRIALS keeps the largest sizes tractable
+SIM_TRIALS = 2_000
+
+
+def generate_league(league_id, num_teams, num_weeks, current_week, rng):
+    """Generate an ESPN-shaped league payload with teams, rosters and a round-robin schedule"""
+    teams = []
+    for team_id in range(1, num_teams + 1):
+        wins = rng.randint(0, current_week - 1)
+        entries = []
+        for slot_idx, lineup_slot_id in enumerate(ROSTER_SLOTS):
+            entries.append({
+                'lineupSlotId': lineup_slot_id,
+                'playerPoolEntry': {
+                    'player': {
+                        'fullName': f"Player {league_id}-{team_id}-{slot_idx}",
+                        'proTeamId': rng.choice(list(utils.NFL_TEAMS.keys()))
+                    },
+                    'ratings': {'0': {'positionalRanking': rng.randint(1, 40)}}
+                }
+            })
+        teams.append({
+            'id': team_id,
+            'name': f"Team {league_id}-{team_id}",
+            'logo': f"https://example.com/{league_id}/{team_id}.png",
+            'record': {'overall': {
+                'wins': wins,
+                'losses': current_week - 1 - wins,
+                'pointsFor': rng.uniform(80, 160) * (current_week - 1),
+                'pointsAgainst': rng.uniform(80, 160) * (current_week - 1),
+                'streakType': rng.choice(['WIN', 'LOSS']),
+                'streakLength': rng.randint(1, 5)
+            }},
+            'transactionCounter': {'acquisitions': rng.randint(0, 30)},
+            'roster': {'entries': entries}
+        })
+
+    # Circle-method round robin; the odd team out gets a bye (no away side)
+    team_ids = [team['id'] for team in teams]
+    if len(team_ids) % 2:
+        team_ids.append(None)
+    schedule = []
+    for week in range(1, num_weeks + 1):
+        for i in range(len(team_ids) // 2):
+            home_id, away_id = team_ids[i], team_ids[-1 - i]
+            if home_id is None:
+                home_id, away_id = away_id, None
+            played = week <= current_week
+            matchup = {
+                'matchupPeriodId': week,
+                'home': {'teamId': home_id,
+                         'totalPoints': round(rng.uniform(70, 180), 2) if played else 0,
+                         'totalPointsLive': round(rng.uniform(70, 180), 2) if played else 0}
+            }
+            if away_id is not None:
+                matchup['away'] = {'teamId': away_id,
+                                   'totalPoints': round(rng.uniform(70, 180), 2) if played else 0,
+                                   'totalPointsLive': round(rng.uniform(70, 180), 2) if played else 0}
+            schedule.append(matchup)
+        team_ids = [team_ids[0], team_ids[-1]] + team_ids[1:-1]
+
+    return {'id': league_id, 'scoringPeriodId': current_week, 'teams': teams, 'schedule': schedule}
+
+
+def generate_leagues(num_divisions, teams_per_division, num_weeks, seed=0):
+    """Generate {division name: (league_id, payload)} for a synthetic multi-division league"""
+    rng = random.Random(seed)
+    current_week = max(num_weeks - 4, 1)
+    return {
+        f"Division {idx + 1}": (str(1000 + idx), generate_league(str(1000 + idx), teams_per_division, num_weeks,
+                                                                current_week, rng))
+        for idx in range(num_divisions)
+    }
+
+
+def live_week_update(leagues, seed=1):
+    """Parse the leagues again with new live-week scores, as a refresh during a game window would"""
+    rng = random.Random(seed)
+    snapshot = {}
+    for league_id, data in leagues.values():
+        schedule = []
+        for matchup in data['schedule']:
+            if matchup['matchupPeriodId'] == data['scoringPeriodId']:
+                matchup = {**matchup, 'home': {**matchup['home'], 'totalPointsLive': round(rng.uniform(70, 180), 2)}}
+            schedule.append(matchup)
+        snapshot[league_id] = utils.parse_league({**data, 'schedule': schedule})
+    return snapshot
+
+
+@contextmanager
+def synthetic_snapshot(leagues):
+    """Point utils.LEAGUES and the rerun snapshot at synthetic leagues for the duration of the block"""
+    saved_leagues = utils.LEAGUES
+    utils.LEAGUES = {name: league_id for name, (league_id, _) in leagues.items()}
+    utils.begin_rerun()
+    utils.st.session_state[utils._SNAPSHOT_KEY] = {league_id: utils.parse_league(data)
+                                                   for league_id, data in leagues.values()}
+    # Benchmarks never touch the network
+    assets.MIRROR_ENABLED = False
+    utils._CACHE.set('nfl_logos', None, {abbr: f"https://example.com/nfl/{abbr}.png"
+                                         for abbr in utils.NFL_TEAMS.values()})
+    try:
+        yield
+    finally:
+        utils.LEAGUES = saved_leagues
+        utils.begin_rerun()
+
+
+def time_call(func, repeat):
+    """Run func repeat times and return the per-call timings in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def benchmark_size(num_divisions, teams_per_division, num_weeks, repeat):
+    """Time every stage for one league size and return {stage: timings}"""
+    leagues = generate_leagues(num_divisions, teams_per_division, num_weeks)
+    payloads = [data for _, data in leagues.values()]
+
+    with synthetic_snapshot(leagues):
+        parsed = [(name, utils.get_league_data(league_id)) for name, league_id in utils.LEAGUES.items()]
+
+        def roster_all():
+            for _, league in parsed:
+                for team_id in league.teams:
+                    utils.get_team_roster(league, team_id)
+
+        # Two parses of the same leagues whose live-week scores differ, swapped in to time a live refresh
+        live_snapshots = [dict(utils.st.session_state[utils._SNAPSHOT_KEY]), live_week_update(leagues)]
+
+        def rebuild_matchups():
+            utils._MATCHUP_TABLE['leagues'] = None
+            return utils.fetch_all_matchups()
+
+        # Same work as rebuild_matchups, taking the live-week patch path instead
+        def live_refresh():
+            live_snapshots.reverse()
+            utils.st.session_state[utils._SNAPSHOT_KEY] = live_snapshots[0]
+            return utils.fetch_all_matchups()
+
+        def simulate_odds():
+            utils._PLAYOFF_ODDS['key'] = None
+            return utils.simulate_playoff_odds(parsed, trials=SIM_TRIALS)
+
+        standings_df = utils.fetch_all_leagues()
+        matchups_df = utils.fetch_all_matchups()
+        stages = {
+            'parse_league': lambda: [utils.parse_league(data) for data in payloads],
+            'process_league_standings': lambda: [utils.process_league_standings(l, n) for n, l in parsed],
+            'process_matchups': lambda: [utils.process_matchups(l, n) for n, l in parsed],
+            'get_team_roster': roster_all,
+            'fetch_all_leagues': utils.fetch_all_leagues,
+            'fetch_all_matchups': rebuild_matchups,
+            'live_week_refresh': live_refresh,
+            'calculate_playoff_standings': lambda: utils.calculate_playoff_standings(standings_df, matchups_df),
+            'simulate_playoff_odds': simulate_odds
+        }
+        timings = {stage: time_call(func, repeat) for stage, func in stages.items()}
+        utils.st.session_state[utils._SNAPSHOT_KEY] = live_snapshots[-1]
+        return timings
+
+
+def git_commit():
+    """Get the current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def scaling_exponents(records):
+    """Fit time ~ teams^k per stage on a log-log scale and return {stage: k}"""
+    exponents = {}
+    for stage in sorted({record['stage'] for record in records}):
+        points = [(record['teams'], record['median_s']) for record in records
+                  if record['stage'] == stage and record['median_s'] > 0]
+        if len(points) >= 2:
+            x = np.log([teams for teams, _ in points])
+            y = np.log([seconds for _, seconds in points])
+            exponents[stage] = float(np.polyfit(x, y, 1)[0])
+    return exponents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data-processing layer")
+    parser.add_argument('--sizes', choices=list(SIZES.keys()), default='full')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=RESULTS_FILE)
+    args = parser.parse_args()
+
+    # Streamlit warns about the missing script context on every call in bare mode
+    streamlit_logger.set_log_level('error')
+
+    run_info = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__
+    }
+
+    records = []
+    for num_divisions, teams_per_division, num_weeks in SIZES[args.sizes]:
+        results = benchmark_size(num_divisions, teams_per_division, num_weeks, args.repeat)
+        for stage, timings in results.items():
+            records.append({
+                **run_info,
+                'stage': stage,
+                'divisions': num_divisions,
+                'teams_per_division': teams_per_division,
+                'weeks': num_weeks,
+                'teams': num_divisions * teams_per_division,
+                'repeat': args.repeat,
+                'median_s': statistics.median(timings),
+                'min_s': min(timings)
+            })
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+    print(f"{'stage':<30}{'size':>14}{'median ms':>12}{'min ms':>10}")
+    for record in records:
+        size = f"{record['divisions']}x{record['teams_per_division']}x{record['weeks']}"
+        print(f"{record['stage']:<30}{size:>14}{record['median_s'] * 1000:>12.2f}{record['min_s'] * 1000:>10.2f}")
+
+    exponents = scaling_exponents(records)
+    if exponents:
+        print("\nScaling with league size (time ~ teams^k)")
+        for stage, exponent in exponents.items():
+            print(f"{stage:<30}k = {exponent:.2f}")
+    print(f"\nResults appended to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
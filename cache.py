@@ -0,0 +1,102 @@
+import threading
+import time
+
+from perf import span
+
+
+class TTLCache:
+    """Thread-safe cache with a TTL per endpoint that serves stale entries while refreshing them"""
+
+    def __init__(self, ttls, default_ttl=60):
+        self.ttls = dict(ttls)
+        self.default_ttl = default_ttl
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+    def ttl(self, endpoint):
+        """Get the TTL in seconds for an endpoint"""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint, key, loader):
+        """Return the cached value for (endpoint, key), calling loader() on a miss
+
+        Stale entries are returned immediately and refreshed on a background thread.
+        Exceptions raised by loader() on a miss propagate and nothing is cached.
+        """
+        cache_key = (endpoint, key)
+        with span(f"cache:{endpoint}", key=str(key)) as record:
+            with self._lock:
+                entry = self._entries.get(cache_key)
+                if entry is not None:
+                    value, fetched_at = entry
+                    record['cache_hit'] = True
+                    if time.monotonic() - fetched_at < self.ttl(endpoint):
+                        self._stats['hits'] += 1
+                        return value
+
+                    # Stale: serve what we have and revalidate in the background
+                    self._stats['stale_hits'] += 1
+                    record['stale'] = True
+                    if cache_key not in self._refreshing:
+                        self._refreshing.add(cache_key)
+                        threading.Thread(target=self._refresh, args=(cache_key, loader), daemon=True).start()
+                    return value
+
+                self._stats['misses'] += 1
+                record['cache_hit'] = False
+
+            value = loader()
+            self.set(endpoint, key, value)
+            return value
+
+    def refresh(self, endpoint, key, loader):
+        """Reload (endpoint, key) now whatever its age, letting exceptions from loader() propagate"""
+        value = loader()
+        with self._lock:
+            self._entries[(endpoint, key)] = (value, time.monotonic())
+            self._stats['refreshes'] += 1
+        return value
+
+    def set(self, endpoint, key, value, age=0):
+        """Store a value that was fetched age seconds ago"""
+        with self._lock:
+            self._entries[(endpoint, key)] = (value, time.monotonic() - age)
+
+    def age(self, endpoint, key):
+        """Get how many seconds ago an entry was fetched, or None if it isn't cached"""
+        with self._lock:
+            entry = self._entries.get((endpoint, key))
+        return None if entry is None else time.monotonic() - entry[1]
+
+    def invalidate(self, endpoint=None):
+        """Drop every entry, or only the entries for one endpoint"""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                for cache_key in [k for k in self._entries if k[0] == endpoint]:
+                    del self._entries[cache_key]
+
+    def stats(self):
+        """Get a copy of the hit/miss/refresh counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+    def _refresh(self, cache_key, loader):
+        try:
+            value = loader()
+        except Exception:
+            # Keep serving the stale entry; the next stale read retries
+            with self._lock:
+                self._stats['refresh_errors'] += 1
+                self._refreshing.discard(cache_key)
+            return
+
+        with self._lock:
+            self._entries[cache_key] = (value, time.monotonic())
+            self._stats['refreshes'] += 1
+            self._refreshing.discard(cache_key)
@@ -0,0 +1,64 @@
+import threading
+import time
+
+import requests
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    """Stops calls to a failing host for a cool-down, then lets one trial call through
+
+    closed: calls go through and consecutive failures are counted.
+    open: calls fail fast with CircuitOpenError until reset_after seconds pass.
+    half_open: one trial call goes through; success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_after=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self._stats = {'opened': 0, 'rejected': 0}
+
+    def before_call(self):
+        """Raise CircuitOpenError if a call to this host shouldn't be sent now"""
+        with self._lock:
+            if self._state == 'open' and time.monotonic() - self._opened_at >= self.reset_after:
+                self._state = 'half_open'
+                self._trial_running = False
+            if self._state == 'closed':
+                return
+            if self._state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return
+            self._stats['rejected'] += 1
+            retry_in = max(self.reset_after - (time.monotonic() - self._opened_at), 0)
+        raise CircuitOpenError(f"Circuit open for {self.name}; retrying in {retry_in:.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self._state = 'closed'
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == 'half_open' or self._failures >= self.failure_threshold:
+                if self._state != 'open':
+                    self._stats['opened'] += 1
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+                self._trial_running = False
+
+    def stats(self):
+        """Get the circuit state, consecutive failures and open/reject counters"""
+        with self._lock:
+            return {'state': self._state, 'consecutive_failures': self._failures, **self._stats}
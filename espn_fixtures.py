@@ -0,0 +1,216 @@
+"""Record ESPN responses and replay them from a local stand-in server.
+
+Record every URL the dashboard fetches:
+
+    python espn_fixtures.py record
+
+Serve the recordings with 50ms +/- 20ms latency and 5% failures:
+
+    python espn_fixtures.py serve --latency 0.05 --jitter 0.02 --failure-rate 0.05
+
+Then run the app against the stand-in server instead of ESPN:
+
+    ESPN_FIXTURE_URL=http://127.0.0.1:8765 streamlit run main.py
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+FIXTURE_DIR = "fixtures"
+INDEX_FILE = "index.json"
+
+
+def fixture_key(url):
+    """Get the replay key for an upstream URL: host, path and query"""
+    parts = urlsplit(url)
+    # HTTP clients drop an empty query, so only a non-empty one is part of the key
+    return f"{parts.netloc}{parts.path}?{parts.query}" if parts.query else f"{parts.netloc}{parts.path}"
+
+
+def fixture_filename(key):
+    """Get the fixture file name for a replay key"""
+    return hashlib.sha1(key.encode('utf-8')).hexdigest() + ".json"
+
+
+def fixture_url(base_url, url):
+    """Rewrite an upstream URL so it is served by the stand-in server at base_url"""
+    return f"{base_url.rstrip('/')}/{fixture_key(url)}"
+
+
+def recorded_urls():
+    """List every upstream URL the dashboard fetches"""
+    # Imported here so serving doesn't need Streamlit
+    from utils import LEAGUES, HOT_VIEWS, COLD_VIEWS, NFL_LOGOS_URL, NFL_SCOREBOARD_URL, build_league_url
+
+    urls = [NFL_LOGOS_URL, NFL_SCOREBOARD_URL]
+    for league_id in LEAGUES.values():
+        urls.append(build_league_url(league_id, HOT_VIEWS))
+        urls.append(build_league_url(league_id, COLD_VIEWS))
+    return urls
+
+
+def logo_urls(fixture_dir, index):
+    """List the team and NFL logo URLs referenced by the recorded JSON fixtures"""
+    urls = set()
+    for filename in set(index.values()):
+        try:
+            with open(os.path.join(fixture_dir, filename), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Not a JSON fixture, e.g. an already recorded logo
+            continue
+        if not isinstance(data, dict):
+            continue
+        urls.update(team.get('logo') for team in data.get('teams', []))
+        for sport in data.get('sports', []):
+            for league in sport.get('leagues', []):
+                for entry in league.get('teams', []):
+                    urls.update(logo.get('href') for logo in entry.get('team', {}).get('logos', [])[:1])
+    return sorted(url for url in urls if url)
+
+
+def record_fixtures(fixture_dir=FIXTURE_DIR, urls=None, required=True):
+    """Fetch each URL from ESPN and save the response body as a fixture, skipping failures unless required"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    index_path = os.path.join(fixture_dir, INDEX_FILE)
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+
+    for url in urls or recorded_urls():
+        try:
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if required:
+                raise
+            print(f"Skipped {url}: {e}")
+            continue
+        key = fixture_key(url)
+        filename = fixture_filename(key)
+        with open(os.path.join(fixture_dir, filename), 'wb') as f:
+            f.write(response.content)
+        index[key] = filename
+        print(f"Recorded {len(response.content):>9,} bytes  {url}")
+
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Threaded HTTP server replaying recorded fixtures with injected latency and failures"""
+
+    daemon_threads = True
+
+    def __init__(self, address, fixture_dir=FIXTURE_DIR, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        super().__init__(address, FixtureRequestHandler)
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        with open(os.path.join(fixture_dir, INDEX_FILE), 'r') as f:
+            self.index = json.load(f)
+        self.stats = {'requests': 0, 'served': 0, 'not_modified': 0, 'failed': 0, 'missing': 0}
+
+    def draw(self):
+        """Draw (delay, fail) for one request from the seeded generator"""
+        with self._random_lock:
+            delay = max(self.latency + self._random.uniform(-self.jitter, self.jitter), 0.0)
+            fail = self._random.random() < self.failure_rate
+        return delay, fail
+
+    def count(self, outcome):
+        with self._random_lock:
+            self.stats['requests'] += 1
+            self.stats[outcome] += 1
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serve /<host>/<path>?<query> from the fixture index"""
+
+    def do_GET(self):
+        delay, fail = self.server.draw()
+        time.sleep(delay)
+
+        if fail:
+            self.server.count('failed')
+            self.send_error(503, "Injected failure")
+            return
+
+        filename = self.server.index.get(self.path.lstrip('/'))
+        if filename is None:
+            self.server.count('missing')
+            self.send_error(404, "No fixture recorded for this URL")
+            return
+
+        with open(os.path.join(self.server.fixture_dir, filename), 'rb') as f:
+            body = f.read()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self.server.count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.server.count('served')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep load tests quiet
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record ESPN responses or replay them from a local server")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help="Record live ESPN responses as fixtures")
+    record_parser.add_argument('--dir', default=FIXTURE_DIR)
+
+    serve_parser = subparsers.add_parser('serve', help="Replay recorded fixtures from a local HTTP server")
+    serve_parser.add_argument('--dir', default=FIXTURE_DIR)
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help="Base response delay in seconds")
+    serve_parser.add_argument('--jitter', type=float, default=0.0, help="Uniform +/- delay added to the base latency")
+    serve_parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    serve_parser.add_argument('--seed', type=int, default=None, help="Seed for reproducible latency and failures")
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        index = record_fixtures(args.dir)
+        # Logos too, so the app never leaves the stand-in server
+        record_fixtures(args.dir, logo_urls(args.dir, index), required=False)
+    else:
+        server = FixtureServer((args.host, args.port), args.dir, args.latency, args.jitter, args.failure_rate,
+                               args.seed)
+        print(f"Serving {len(server.index)} fixtures from {args.dir} on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print(json.dumps(server.stats))
+
+
+if __name__ == '__main__':
+    main()
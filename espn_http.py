@@ -0,0 +1,232 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import CircuitBreaker
+from perf import span
+from single_flight import SingleFlight
+
+
+def _is_retryable(error):
+    """Whether a failed request is worth retrying: network errors, timeouts, 429 and 5xx responses"""
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status == 429 or (status is not None and status >= 500)
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+def _extract_stream(extract, response):
+    """Decode a streamed body with extract, raising the errors response.json() would have raised"""
+    try:
+        return extract(response.raw)
+    except urllib3.exceptions.ProtocolError as e:
+        # The connection dropped mid-body
+        raise requests.exceptions.ChunkedEncodingError(e, response=response) from e
+    except urllib3.exceptions.DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e, response=response) from e
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e, response=response) from e
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(e, response=response) from e
+
+
+def _request_key(url, headers):
+    """Key a request by its URL and any extra headers, which can change the response"""
+    return (url, tuple(sorted(headers.items()))) if headers else url
+
+
+class ESPNSession:
+    """Pooled keep-alive HTTP session that revalidates JSON documents with ETag/Last-Modified
+
+    Failed requests are retried with exponential backoff and full jitter
+    (never sooner than a Retry-After header asks), and a per-host circuit
+    breaker fails fast while a host keeps failing.
+    """
+
+    def __init__(self, timeout=10, pool_maxsize=10, budget=None, retries=2, backoff=0.5, max_backoff=4,
+                 failure_threshold=5, reset_after=30):
+        self.timeout = timeout
+        # Optional RequestBudget that every request sent is counted against
+        self.budget = budget
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._breakers = {}
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self._session = requests.Session()
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+        self._session.headers.update({'Accept': 'application/json', 'Accept-Encoding': 'gzip, deflate'})
+        # request key -> (etag, last_modified, wire_bytes, parsed json)
+        self._validators = {}
+        self._host_stats = {}
+        self._lock = threading.Lock()
+        # Concurrent requests for the same URL share one upstream call
+        self._flights = SingleFlight()
+
+    def get_json(self, url, headers=None, extract=None):
+        """GET a JSON document, sending conditional headers and reusing the cached body on a 304
+
+        extract, if given, decodes the body from the raw response stream
+        instead of response.json(), so it can skip fields nobody reads; it
+        raises ValueError on a body that isn't valid JSON.
+        Callers asking for a URL that is already being fetched wait for that
+        request and get the same document.
+        """
+        key = _request_key(url, headers)
+        return self._flights.do(key, lambda: self._get_json_with_retries(url, headers, extract))
+
+    def _breaker(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_after)
+        return breaker
+
+    def _get_json_with_retries(self, url, headers, extract):
+        host = urlsplit(url).hostname
+        breaker = self._breaker(host)
+        for attempt in range(self.retries + 1):
+            breaker.before_call()
+            if attempt:
+                self._count(host, 'retries')
+            try:
+                data = self._get_json(url, headers, extract)
+            except requests.exceptions.RequestException as e:
+                if not _is_retryable(e):
+                    # The host answered; the request itself is wrong
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                self._count(host, 'failures')
+                if attempt == self.retries:
+                    raise
+                delay = min(random.uniform(0, self.backoff * 2 ** attempt), self.max_backoff)
+                retry_after = e.response.headers.get('Retry-After') if e.response is not None else None
+                if retry_after and retry_after.isdigit():
+                    # ESPN asked for a specific wait on a 429 or 503; retrying
+                    # any sooner only adds to the load, so give up if it is too long
+                    if float(retry_after) > self.max_backoff:
+                        raise
+                    delay = float(retry_after)
+                with span('espn_retry', host=host, attempt=attempt + 1):
+                    time.sleep(delay)
+            except Exception:
+                # Not a network error, but it still ends a half-open trial call
+                breaker.record_failure()
+                self._count(host, 'failures')
+                raise
+            else:
+                breaker.record_success()
+                return data
+
+    def _get_json(self, url, headers, extract):
+        request_headers = dict(headers or {})
+        # Headers like x-fantasy-filter change the body, so they are part of the key
+        key = _request_key(url, headers)
+        with self._lock:
+            cached = self._validators.get(key)
+        if cached is not None:
+            etag, last_modified, _, _ = cached
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if last_modified:
+                request_headers['If-Modified-Since'] = last_modified
+
+        host = urlsplit(url).hostname
+        with span('espn_fetch', host=host) as record:
+            if self.budget is not None:
+                self.budget.record()
+            response = self._session.get(url, headers=request_headers, timeout=self.timeout,
+                                         stream=extract is not None)
+            record['status'] = response.status_code
+
+            if response.status_code == 304 and cached is not None:
+                response.close()
+                record['bytes'] = 0
+                record['cache_hit'] = True
+                self._record(host, not_modified=True, bytes_received=0, bytes_saved=cached[2])
+                return cached[3]
+
+            if not response.ok:
+                response.close()
+            response.raise_for_status()
+            record['cache_hit'] = False
+            if extract is None:
+                wire_bytes = int(response.headers.get('Content-Length') or len(response.content))
+                record['bytes'] = wire_bytes
+
+        with span('json_parse', host=host) as parse_record:
+            if extract is None:
+                data = response.json()
+            else:
+                # The body is downloaded while it is decoded
+                with response:
+                    response.raw.decode_content = True
+                    data = _extract_stream(extract, response)
+                    wire_bytes = response.raw.tell()
+                record['bytes'] = wire_bytes
+            parse_record['bytes'] = wire_bytes
+        self._record(host, not_modified=False, bytes_received=wire_bytes, bytes_saved=0)
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._lock:
+                self._validators[key] = (etag, last_modified, wire_bytes, data)
+        return data
+
+    def flight_stats(self):
+        """Get how many callers joined each in-flight request instead of sending their own"""
+        return self._flights.stats()
+
+    def stats(self):
+        """Get per-host request, 304, byte and connection reuse counters"""
+        with self._lock:
+            stats = {host: dict(counters) for host, counters in self._host_stats.items()}
+
+        for counters in stats.values():
+            counters['connections_opened'] = 0
+            counters['connections_reused'] = 0
+
+        with self._lock:
+            breakers = dict(self._breakers)
+        for host, breaker in breakers.items():
+            if host in stats:
+                stats[host]['circuit'] = breaker.stats()
+
+        # Connection counters live on urllib3's per-host pools
+        pools = self._adapter.poolmanager.pools
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            counters = stats.get(pool_key.key_host)
+            if pool is None or counters is None:
+                continue
+            counters['connections_opened'] += pool.num_connections
+            counters['connections_reused'] += max(pool.num_requests - pool.num_connections, 0)
+        return stats
+
+    def _host_counters(self, host):
+        return self._host_stats.setdefault(host, {
+            'requests': 0, 'not_modified': 0, 'bytes_received': 0, 'bytes_saved': 0, 'failures': 0, 'retries': 0
+        })
+
+    def _count(self, host, counter):
+        with self._lock:
+            self._host_counters(host)[counter] += 1
+
+    def _record(self, host, not_modified, bytes_received, bytes_saved):
+        with self._lock:
+            counters = self._host_counters(host)
+            counters['requests'] += 1
+            counters['not_modified'] += int(not_modified)
+            counters['bytes_received'] += bytes_received
+            counters['bytes_saved'] += bytes_saved
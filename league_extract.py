@@ -0,0 +1,109 @@
+import json
+
+try:
+    import ijson
+except ImportError:
+    # Without ijson, payloads are fully decoded and then pruned
+    ijson = None
+
+# The parts of a league payload the dashboard reads. A dict keeps only the
+# listed keys of a map (of every element when the value is a list), True keeps
+# the whole value.
+_ROSTER_FIELDS = {
+    'entries': {
+        'lineupSlotId': True,
+        'playerPoolEntry': {
+            'player': {'fullName': True, 'proTeamId': True},
+            'ratings': {'0': {'positionalRanking': True}}
+        }
+    }
+}
+_SIDE_FIELDS = {'teamId': True, 'totalPoints': True, 'totalPointsLive': True}
+LEAGUE_FIELDS = {
+    'id': True,
+    'scoringPeriodId': True,
+    'teams': {
+        'id': True,
+        'name': True,
+        'logo': True,
+        'record': {'overall': {
+            'wins': True, 'losses': True, 'pointsFor': True, 'pointsAgainst': True,
+            'streakType': True, 'streakLength': True
+        }},
+        'transactionCounter': {'acquisitions': True},
+        'roster': _ROSTER_FIELDS
+    },
+    'schedule': {'matchupPeriodId': True, 'playoffTierType': True, 'home': _SIDE_FIELDS, 'away': _SIDE_FIELDS},
+    'draftDetail': {'teams': {'id': True, 'roster': _ROSTER_FIELDS}}
+}
+
+
+def prune(value, fields):
+    """Copy only the parts of a decoded JSON value selected by fields"""
+    if fields is True:
+        return value
+    if isinstance(value, list):
+        return [prune(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {key: prune(item, fields[key]) for key, item in value.items() if key in fields}
+    return value
+
+
+_OPEN_EVENTS = frozenset(('start_map', 'start_array'))
+_CLOSE_EVENTS = frozenset(('end_map', 'end_array'))
+
+
+def _skip(events, event):
+    """Consume the rest of a value whose first event has been read"""
+    if event not in _OPEN_EVENTS:
+        return
+    depth = 1
+    for event, _ in events:
+        if event in _OPEN_EVENTS:
+            depth += 1
+        elif event in _CLOSE_EVENTS:
+            depth -= 1
+            if not depth:
+                return
+
+
+def _build(events, event, value, fields):
+    """Build the selected parts of a value from ijson events, given its first event"""
+    if event == 'start_map':
+        result = {}
+        for event, value in events:
+            if event == 'end_map':
+                return result
+            # Every other event at this level is a map_key
+            item_fields = True if fields is True else fields.get(value)
+            event, item = next(events)
+            if item_fields is None:
+                _skip(events, event)
+            else:
+                result[value] = _build(events, event, item, item_fields)
+    if event == 'start_array':
+        result = []
+        for event, value in events:
+            if event == 'end_array':
+                return result
+            result.append(_build(events, event, value, fields))
+    return value
+
+
+def extract_league(stream, fields=LEAGUE_FIELDS):
+    """Decode only the league fields the dashboard reads (or the given fields) from a binary JSON stream
+
+    With ijson installed the payload is built straight from the stream, so
+    unused views are never turned into Python objects. Raises ValueError if
+    the stream isn't valid JSON, either way.
+    """
+    if ijson is not None:
+        try:
+            events = ijson.basic_parse(stream, use_float=True)
+            event, value = next(events)
+            data = _build(events, event, value, fields)
+        except (ijson.JSONError, StopIteration) as e:
+            raise ValueError(f"Invalid JSON: {e!r}") from e
+    else:
+        data = prune(json.load(stream), fields)
+    return data
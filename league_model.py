@@ -0,0 +1,71 @@
+class Team:
+    """A fantasy team's identity, owner display strings and season record"""
+
+    __slots__ = ('id', 'name', 'logo', 'owner', 'display_name', 'wins', 'losses', 'points_for', 'points_against',
+                 'streak', 'transactions')
+
+    def __init__(self, id, name, logo, owner, wins, losses, points_for, points_against, streak, transactions):
+        self.id = id
+        self.name = name
+        self.logo = logo
+        self.owner = owner
+        self.display_name = f"{name} ({owner})" if owner else name
+        self.wins = wins
+        self.losses = losses
+        self.points_for = points_for
+        self.points_against = points_against
+        self.streak = streak
+        self.transactions = transactions
+
+
+class Matchup:
+    """One scheduled matchup with scores already resolved to live or final and rounded
+
+    away_id and away_score are None for a bye; playoff is True for ESPN
+    playoff bracket games.
+    """
+
+    __slots__ = ('week', 'home_id', 'home_score', 'away_id', 'away_score', 'playoff')
+
+    def __init__(self, week, home_id, home_score, away_id, away_score, playoff=False):
+        self.week = week
+        self.home_id = home_id
+        self.home_score = home_score
+        self.away_id = away_id
+        self.away_score = away_score
+        self.playoff = playoff
+
+
+class Player:
+    """A rostered player in one of the lineup slots the dashboard shows"""
+
+    __slots__ = ('name', 'position', 'nfl_team', 'rank', 'sort')
+
+    def __init__(self, name, position, nfl_team, rank, sort):
+        self.name = name
+        self.position = position
+        self.nfl_team = nfl_team
+        self.rank = rank
+        self.sort = sort
+
+
+class League:
+    """Everything the dashboard reads from one ESPN league payload
+
+    teams maps team_id to Team in payload order, schedule lists Matchups in
+    payload order and rosters maps team_id to Players sorted by position.
+    """
+
+    __slots__ = ('id', 'current_week', 'teams', 'schedule', 'rosters')
+
+    def __init__(self, id, current_week, teams, schedule, rosters):
+        self.id = id
+        self.current_week = current_week
+        self.teams = teams
+        self.schedule = schedule
+        self.rosters = rosters
+
+    def team_name(self, team_id):
+        """Get a team's name, or 'Unknown' if it isn't in this league"""
+        team = self.teams.get(team_id)
+        return team.name if team else 'Unknown'
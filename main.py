@@ -1,8 +1,18 @@
 import streamlit as st
-import base64
 from page_home import render_home_tab
 from page_teams import render_teams_tab
 from page_playoffs import render_playoffs_tab
+from assets import get_local_image
+from page_debug import render_perf_panel
+from perf import start_trace
+from utils import (begin_rerun, warm_up_caches, get_data_age, format_age, CACHE_TTLS, start_refresh_scheduler,
+                   get_data_version, restore_snapshots)
+
+# Prefetch data for the views that aren't shown after each rerun
+WARM_UP_OTHER_VIEWS = True
+
+# Seconds between checks for data brought in by scheduled refreshes
+NEW_DATA_CHECK_INTERVAL = CACHE_TTLS['league_hot']
 
 # Page configuration
 st.set_page_config(
@@ -11,31 +21,58 @@ st.set_page_config(
     layout="wide"
 )
 
+# Start every rerun from a fresh league snapshot and an empty timing trace
+trace = start_trace()
+restore_snapshots()
+begin_rerun()
+start_refresh_scheduler()
+
+# Taken before rendering, so data arriving mid-render still triggers the next rerun
+st.session_state['data_version'] = get_data_version()
+
 # Header
 col1, col2, col3 = st.columns([1, 2, 1])
 
 with col2:
     st.markdown(
-        f'<div style="text-align: center"><img src="data:image/png;base64,{base64.b64encode(open("coachSmith.png", "rb").read()).decode()}" width="53"></div>',
+        f'<div style="text-align: center"><img src="{get_local_image("coachSmith.png", size=106)}" width="53"></div>',
         unsafe_allow_html=True
     )
     st.markdown("<h1 style='text-align: center'><em>SBS League Dashboard</em></h1>", unsafe_allow_html=True)
     st.markdown("<h3 style='text-align: center; color: orange'>2025 quest for the Coach Smith Cup</h3>", unsafe_allow_html=True)
 
-# Navigation tabs
-tab1, tab2, tab3 = st.tabs(["Home", "Teams", "Playoffs"])
+# Flag data older than a refresh cycle (cold start or ESPN unreachable)
+data_age = get_data_age()
+if data_age is not None and data_age > CACHE_TTLS['league_hot']:
+    st.caption(f"Showing saved data from {format_age(data_age)} ago while live data loads")
+
+# Navigation - only the selected view is computed on each rerun
+VIEWS = {
+    "Home": render_home_tab,
+    "Teams": render_teams_tab,
+    "Playoffs": render_playoffs_tab
+}
+
+active_view = st.radio("Navigation", options=list(VIEWS.keys()), horizontal=True,
+                       label_visibility="collapsed", key="active_view")
+VIEWS[active_view]()
+
+# Keep the shared caches warm so switching views doesn't wait on ESPN
+if WARM_UP_OTHER_VIEWS:
+    warm_up_caches()
+
+# Rerun once scheduled refreshes have brought in data this page hasn't shown
+@st.fragment(run_every=NEW_DATA_CHECK_INTERVAL)
+def watch_for_new_data():
+    if get_data_version() != st.session_state.get('data_version'):
+        st.rerun()
 
-# HOME TAB
-with tab1:
-    render_home_tab()
 
-# TEAMS TAB
-with tab2:
-    render_teams_tab()
+watch_for_new_data()
 
-# PLAYOFFS TAB
-with tab3:
-    render_playoffs_tab()
+# Hidden performance panel, shown with ?debug=perf
+if st.query_params.get("debug") == "perf":
+    render_perf_panel(trace)
 
 # Footer
 st.caption("_Data sourced from ESPN Fantasy Football API - Created by Nick Bledsoe (2025)_")
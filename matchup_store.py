@@ -0,0 +1,146 @@
+import json
+import os
+import sqlite3
+import threading
+
+MATCHUPS_DB = "playoff_matchups.db"
+
+# Matchups saved before the SQLite store; imported once when the database is created
+LEGACY_MATCHUPS_FILE = "playoff_matchups.json"
+
+# Seconds a writer waits for another process's write lock before failing
+BUSY_TIMEOUT = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS playoff_matchups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    week INTEGER NOT NULL,
+    team1 TEXT NOT NULL,
+    team2 TEXT NOT NULL,
+    pair_key TEXT NOT NULL,
+    UNIQUE (week, pair_key)
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0);
+"""
+
+
+def _pair_key(team1, team2):
+    """Key a matchup by its two teams in either order"""
+    return '|'.join(sorted(f"{team['league_id']}:{team['team_id']}" for team in (team1, team2)))
+
+
+class MatchupStore:
+    """Playoff matchups in SQLite (WAL mode) with an in-process read cache
+
+    Every write bumps a version row in the same transaction; reads reuse the
+    cached matchups until the version changes, whichever process wrote it.
+    """
+
+    def __init__(self, path=MATCHUPS_DB, legacy_file=LEGACY_MATCHUPS_FILE):
+        self.path = path
+        self.legacy_file = legacy_file
+        self._conn = None
+        self._cache = (None, {})
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._import_legacy(conn)
+            except BaseException:
+                # Nothing was committed; the next call starts over with a new connection
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def _import_legacy(self, conn):
+        """Copy matchups from the legacy JSON file into an empty store, once"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            imported = conn.execute("SELECT value FROM store_meta WHERE key = 'legacy_imported'").fetchone()
+            if imported is None and os.path.exists(self.legacy_file):
+                with open(self.legacy_file, 'r') as f:
+                    legacy = json.load(f)
+                try:
+                    for week, matchups in legacy.items():
+                        for matchup in matchups:
+                            self._insert(conn, int(week), matchup['team1'], matchup['team2'])
+                except (AttributeError, KeyError, TypeError) as e:
+                    raise ValueError(f"Malformed {self.legacy_file}: {e!r}") from e
+                conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+            conn.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('legacy_imported', 1)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _insert(conn, week, team1, team2):
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO playoff_matchups (week, team1, team2, pair_key) VALUES (?, ?, ?, ?)",
+            (week, json.dumps(team1), json.dumps(team2), _pair_key(team1, team2))
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def _write(self, statement):
+        """Run statement(conn) in a write transaction that also bumps the version if any row changed"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                changes = conn.total_changes
+                result = statement(conn)
+                if conn.total_changes != changes:
+                    conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def version(self):
+        """Get the store's data version, which changes on every write"""
+        with self._lock:
+            return self._connection().execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+
+    def load(self):
+        """Get {week: [matchup, ...]} in creation order; each matchup has 'id', 'team1' and 'team2'
+
+        The returned dict is shared between callers until the next write and must not be modified.
+        """
+        with self._lock:
+            conn = self._connection()
+            version = conn.execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+            cached_version, matchups = self._cache
+            if cached_version == version:
+                return matchups
+
+            matchups = {}
+            for matchup_id, week, team1, team2 in conn.execute(
+                    "SELECT id, week, team1, team2 FROM playoff_matchups ORDER BY week, id"):
+                matchups.setdefault(week, []).append({
+                    'id': matchup_id,
+                    'team1': json.loads(team1),
+                    'team2': json.loads(team2)
+                })
+            self._cache = (version, matchups)
+            return matchups
+
+    def add(self, week, team1, team2):
+        """Add a matchup and return its id, or None if those teams already meet that week"""
+        return self._write(lambda conn: self._insert(conn, week, team1, team2))
+
+    def delete(self, matchup_id):
+        """Delete a matchup by id and return whether it existed"""
+        return self._write(
+            lambda conn: conn.execute("DELETE FROM playoff_matchups WHERE id = ?", (matchup_id,)).rowcount > 0
+        )
@@ -0,0 +1,54 @@
+from utils import *
+
+
+def render_perf_panel(trace):
+    """Show the current rerun's timing spans plus cache and HTTP counters"""
+    with st.expander("Performance", expanded=True):
+        if not trace:
+            st.info("No spans recorded this rerun")
+            return
+
+        spans_df = pd.DataFrame(trace)
+        for column in ['bytes', 'cache_hit']:
+            if column not in spans_df:
+                spans_df[column] = None
+
+        summary_df = spans_df.groupby('name', sort=False).agg(
+            calls=('ms', 'size'),
+            total_ms=('ms', 'sum'),
+            max_ms=('ms', 'max'),
+            bytes=('bytes', 'sum'),
+            cache_hits=('cache_hit', lambda hits: int((hits == True).sum()))
+        ).reset_index().sort_values('total_ms', ascending=False)
+
+        st.markdown("**Per-stage breakdown**")
+        st.dataframe(
+            summary_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "name": st.column_config.TextColumn("Stage", width="medium"),
+                "calls": st.column_config.NumberColumn("Calls", width="small"),
+                "total_ms": st.column_config.NumberColumn("Total ms", format="%.1f"),
+                "max_ms": st.column_config.NumberColumn("Max ms", format="%.1f"),
+                "bytes": st.column_config.NumberColumn("Bytes", format="%d"),
+                "cache_hits": st.column_config.NumberColumn("Cache hits", width="small")
+            }
+        )
+
+        st.markdown("**Spans**")
+        st.dataframe(spans_df, use_container_width=True, hide_index=True)
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown("**Cache**")
+            st.json(get_cache_stats())
+        with col2:
+            st.markdown("**HTTP**")
+            st.json(get_http_stats())
+        with col3:
+            st.markdown("**Refresh schedule**")
+            st.json(get_refresh_stats())
+
+        st.markdown("**Request coalescing**")
+        st.json(get_coalescing_stats(), expanded=False)
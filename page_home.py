@@ -1,59 +1,7 @@
 from utils import *
-import json
-import os
-
-MATCHUPS_FILE = "playoff_matchups.json"
-
-
-def load_playoff_matchups():
-    """Load playoff matchups from JSON file"""
-    if os.path.exists(MATCHUPS_FILE):
-        try:
-            with open(MATCHUPS_FILE, 'r') as f:
-                data = json.load(f)
-                # Convert string keys back to integers
-                return {int(k): v for k, v in data.items()}
-        except Exception as e:
-            return {}
-    return {}
-
-
-def get_team_score_for_week(league_id, team_name, week):
-    """Get a specific team's score for a specific week"""
-    league_data = fetch_league_data(league_id)
-    if not league_data or 'schedule' not in league_data:
-        return None
-
-    schedule = league_data.get('schedule', [])
-    teams = league_data.get('teams', [])
-    team_map = {team.get('id'): team.get('name', 'Unknown') for team in teams}
-
-    for matchup in schedule:
-        if matchup.get('matchupPeriodId') == week:
-            home = matchup.get('home', {})
-            away = matchup.get('away', {})
-
-            home_team_id = home.get('teamId')
-            away_team_id = away.get('teamId')
-            home_team_name = team_map.get(home_team_id)
-            away_team_name = team_map.get(away_team_id)
-
-            current_week = league_data.get('scoringPeriodId', 1)
-
-            if home_team_name == team_name:
-                if week == current_week:
-                    return round(home.get('totalPointsLive', 0), 1)
-                else:
-                    return round(home.get('totalPoints', 0), 1)
-            elif away_team_name == team_name:
-                if week == current_week:
-                    return round(away.get('totalPointsLive', 0), 1)
-                else:
-                    return round(away.get('totalPoints', 0), 1)
-
-    return None
 
 
+@timed()
 def render_home_tab():
     st.markdown("")
 
@@ -72,15 +20,18 @@ def render_home_tab():
         playoff_df = calculate_playoff_standings(standings_df, matchups_df)
 
         if playoff_df is not None:
-            eighth_seed_wins = playoff_df.iloc[7]['Wins'] if len(playoff_df) >= 8 else 0
-            playoff_df['GB'] = playoff_df['Wins'] - eighth_seed_wins
-            playoff_df['Team Display'] = playoff_df['Name'].apply(
-                lambda x: f"{x} ({TEAM_OWNERS.get(x, '')})" if TEAM_OWNERS.get(x) else x)
-            playoff_df_display = playoff_df[
-                ['Rank', 'Team Display', 'League', 'Wins', 'GB', 'Points For', 'Streak']].copy()
+            cutoff_wins = playoff_df.iloc[PLAYOFF_SLOTS - 1]['Wins'] if len(playoff_df) >= PLAYOFF_SLOTS else 0
+            playoff_df['GB'] = playoff_df['Wins'] - cutoff_wins
+            columns = ['Rank', 'Team Display', 'League', 'Wins', 'GB', 'Points For', 'Streak']
+
+            odds_df = get_playoff_odds()
+            if odds_df is not None:
+                playoff_df = playoff_df.merge(odds_df, on=['League', 'Name'], how='left')
+                columns.insert(5, 'Playoff %')
+            playoff_df_display = playoff_df[columns].copy()
 
             def color_seed(val):
-                if val <= 8:
+                if val <= PLAYOFF_SLOTS:
                     return 'background-color: #007309'
                 elif val <= 18:
                     return 'background-color: #910016'
@@ -97,12 +48,15 @@ def render_home_tab():
                     "Wins": st.column_config.NumberColumn("W", width="small", format="%.1f"),
                     "GB": st.column_config.NumberColumn("GB", width="small", format="%.1f",
                                                         help="Games back from playoff cutoff (8th seed)"),
+                    "Playoff %": st.column_config.ProgressColumn(
+                        "Odds", format="%.0f%%", min_value=0, max_value=100, width="small",
+                        help=f"Chance of making the playoffs across {PLAYOFF_SIM_TRIALS:,} simulated seasons"),
                     "Points For": st.column_config.NumberColumn("PF", format="%.1f"),
                     "Streak": st.column_config.TextColumn("Streak", width="small")
                 }
             )
 
-            playoff_teams = playoff_df.head(8)
+            playoff_teams = playoff_df.head(PLAYOFF_SLOTS)
             league_counts = playoff_teams['League'].value_counts()
 
             col1, col2, col3 = st.columns(3)
@@ -121,8 +75,6 @@ def render_home_tab():
             with col:
                 league_df = standings_df[standings_df['League'] == league_name].copy()
                 league_df['Rank'] = range(1, len(league_df) + 1)
-                league_df['Team Display'] = league_df['Name'].apply(
-                    lambda x: f"{x} ({TEAM_OWNERS.get(x, '')})" if TEAM_OWNERS.get(x) else x)
                 league_df['Record'] = league_df['Wins'].astype(int).astype(str) + "-" + league_df['Losses'].astype(
                     int).astype(str)
 
@@ -150,44 +102,10 @@ def render_home_tab():
             matchups_df = fetch_all_matchups()
 
         if matchups_df is not None and not matchups_df.empty:
-            weekly_high_scores = []
-
-            for week in sorted(matchups_df['Week'].unique()):
-                week_data = matchups_df[matchups_df['Week'] == week]
-
-                performances = []
-                for _, matchup in week_data.iterrows():
-                    if matchup['Home Score'] > 0 or matchup['Away Score'] > 0:
-                        performances.append({
-                            'Week': week,
-                            'Team Name': matchup['Home Team'],
-                            'League': matchup['League'],
-                            'Score': matchup['Home Score'],
-                            'Opponent': matchup['Away Team']
-                        })
-                        performances.append({
-                            'Week': week,
-                            'Team Name': matchup['Away Team'],
-                            'League': matchup['League'],
-                            'Score': matchup['Away Score'],
-                            'Opponent': matchup['Home Team']
-                        })
-
-                if performances:
-                    highest = max(performances, key=lambda x: x['Score'])
-                    weekly_high_scores.append(highest)
-
-            if weekly_high_scores:
-                high_scores_df = pd.DataFrame(weekly_high_scores)
-                high_scores_df = high_scores_df.sort_values('Week', ascending=False)
+            high_scores_df, highest_overall = summarize_high_scores(matchups_df)
 
-                # Add owner names to team display and opponent display
-                high_scores_df['Team Display'] = high_scores_df['Team Name'].apply(
-                    lambda x: f"{x} ({TEAM_OWNERS.get(x, '')})" if TEAM_OWNERS.get(x) else x
-                )
-                high_scores_df['Opponent Display'] = high_scores_df['Opponent'].apply(
-                    lambda x: f"{x} ({TEAM_OWNERS.get(x, '')})" if TEAM_OWNERS.get(x) else x
-                )
+            if highest_overall is not None:
+                high_scores_df = high_scores_df.sort_values('Week', ascending=False)
 
                 st.dataframe(
                     high_scores_df[['Week', 'Team Display', 'League', 'Score', 'Opponent Display']],
@@ -204,11 +122,8 @@ def render_home_tab():
 
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    highest_overall = high_scores_df.loc[high_scores_df['Score'].idxmax()]
-                    team_with_owner = f"{highest_overall['Team Name']} ({TEAM_OWNERS.get(highest_overall['Team Name'], '')})" if TEAM_OWNERS.get(
-                        highest_overall['Team Name']) else highest_overall['Team Name']
                     st.metric("Highest Score", f"{highest_overall['Score']:.1f}",
-                              f"{team_with_owner} - Week {highest_overall['Week']}")
+                              f"{highest_overall['Team Display']} - Week {highest_overall['Week']}")
                 with col2:
                     avg_high_score = high_scores_df['Score'].mean()
                     st.metric("Average Weekly High", f"{avg_high_score:.1f}")
@@ -308,9 +223,8 @@ def render_home_tab():
                                 home_record = f"({int(home_team_info['Wins'])}-{standings_df[(standings_df['Name'] == matchup['Home Team']) & (standings_df['League'] == league_name)].iloc[0]['Losses']}, {home_team_info['Rank']}{'st' if home_team_info['Rank'] == 1 else 'nd' if home_team_info['Rank'] == 2 else 'rd' if home_team_info['Rank'] == 3 else 'th'})" if home_team_info is not None else ""
                                 away_record = f"({int(away_team_info['Wins'])}-{standings_df[(standings_df['Name'] == matchup['Away Team']) & (standings_df['League'] == league_name)].iloc[0]['Losses']}, {away_team_info['Rank']}{'st' if away_team_info['Rank'] == 1 else 'nd' if away_team_info['Rank'] == 2 else 'rd' if away_team_info['Rank'] == 3 else 'th'})" if away_team_info is not None else ""
 
-                                # Get owner names
-                                home_owner = TEAM_OWNERS.get(matchup['Home Team'], "")
-                                away_owner = TEAM_OWNERS.get(matchup['Away Team'], "")
+                                home_owner = matchup['Home Owner']
+                                away_owner = matchup['Away Owner']
 
                                 with st.container(border=True):
                                     st.markdown(f"""
@@ -368,23 +282,11 @@ def render_home_tab():
                             team1 = matchup['team1']
                             team2 = matchup['team2']
 
-                            # Get team logos
-                            team1_logo = ""
-                            team2_logo = ""
-
-                            league1_data = fetch_league_data(team1['league_id'])
-                            if league1_data and 'teams' in league1_data:
-                                for team in league1_data['teams']:
-                                    if team.get('id') == team1['team_id']:
-                                        team1_logo = team.get('logo', '')
-                                        break
-
-                            league2_data = fetch_league_data(team2['league_id'])
-                            if league2_data and 'teams' in league2_data:
-                                for team in league2_data['teams']:
-                                    if team.get('id') == team2['team_id']:
-                                        team2_logo = team.get('logo', '')
-                                        break
+                            # Get team logos and owners
+                            team1_info = get_team(team1['league_id'], team1['team_id'])
+                            team2_info = get_team(team2['league_id'], team2['team_id'])
+                            team1_logo = get_thumbnail(team1_info.logo) if team1_info else ""
+                            team2_logo = get_thumbnail(team2_info.logo) if team2_info else ""
 
                             # Get seeds from playoff standings
                             team1_seed = "N/A"
@@ -402,8 +304,8 @@ def render_home_tab():
                                     team2_seed = int(team2_row.iloc[0]['Rank'])
 
                             # Get scores for selected week
-                            team1_score = get_team_score_for_week(team1['league_id'], team1['team_name'], selected_week)
-                            team2_score = get_team_score_for_week(team2['league_id'], team2['team_name'], selected_week)
+                            team1_score = get_team_score_for_week(team1['league_id'], team1['team_id'], selected_week)
+                            team2_score = get_team_score_for_week(team2['league_id'], team2['team_id'], selected_week)
 
                             # Determine winner
                             team1_winning = False
@@ -414,9 +316,8 @@ def render_home_tab():
                                 elif team2_score > team1_score:
                                     team2_winning = True
 
-                            # Get owner names
-                            team1_owner = TEAM_OWNERS.get(team1['team_name'], "")
-                            team2_owner = TEAM_OWNERS.get(team2['team_name'], "")
+                            team1_owner = team1_info.owner if team1_info else ""
+                            team2_owner = team2_info.owner if team2_info else ""
 
                             with st.container(border=True):
                                 # Team 1
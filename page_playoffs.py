@@ -1,76 +1,10 @@
 from utils import *
 import streamlit as st
-import json
-import os
-
-MATCHUPS_FILE = "playoff_matchups.json"
-
-
-def load_matchups_from_file():
-    """Load matchups from JSON file"""
-    if os.path.exists(MATCHUPS_FILE):
-        try:
-            with open(MATCHUPS_FILE, 'r') as f:
-                data = json.load(f)
-                # Convert string keys back to integers
-                return {int(k): v for k, v in data.items()}
-        except Exception as e:
-            st.error(f"Failed to load matchups: {e}")
-            return {}
-    return {}
-
-
-def save_matchups_to_file(matchups):
-    """Save matchups to JSON file"""
-    try:
-        with open(MATCHUPS_FILE, 'w') as f:
-            json.dump(matchups, f, indent=2)
-        return True
-    except Exception as e:
-        st.error(f"Failed to save matchups: {e}")
-        return False
-
-
-def get_team_score_for_week(league_id, team_name, week):
-    """Get a specific team's score for a specific week"""
-    league_data = fetch_league_data(league_id)
-    if not league_data or 'schedule' not in league_data:
-        return None
-
-    schedule = league_data.get('schedule', [])
-    teams = league_data.get('teams', [])
-    team_map = {team.get('id'): team.get('name', 'Unknown') for team in teams}
-
-    for matchup in schedule:
-        if matchup.get('matchupPeriodId') == week:
-            home = matchup.get('home', {})
-            away = matchup.get('away', {})
-
-            home_team_id = home.get('teamId')
-            away_team_id = away.get('teamId')
-            home_team_name = team_map.get(home_team_id)
-            away_team_name = team_map.get(away_team_id)
-
-            current_week = league_data.get('scoringPeriodId', 1)
-
-            if home_team_name == team_name:
-                if week == current_week:
-                    return round(home.get('totalPointsLive', 0), 1)
-                else:
-                    return round(home.get('totalPoints', 0), 1)
-            elif away_team_name == team_name:
-                if week == current_week:
-                    return round(away.get('totalPointsLive', 0), 1)
-                else:
-                    return round(away.get('totalPoints', 0), 1)
-
-    return None
 
 
+@timed()
 def render_playoffs_tab():
-    # Initialize session state from file if it doesn't exist
-    if 'playoff_matchups' not in st.session_state:
-        st.session_state.playoff_matchups = load_matchups_from_file()
+    playoff_matchups = load_playoff_matchups()
 
     # Get all teams
     all_teams = get_all_teams()
@@ -140,45 +74,27 @@ def render_playoffs_tab():
                 'league_name']:
                 st.error("Cannot create a matchup with the same team!")
             else:
-                # Initialize week if it doesn't exist
-                if matchup_week not in st.session_state.playoff_matchups:
-                    st.session_state.playoff_matchups[matchup_week] = []
-
-                # Check if matchup already exists for this week
-                exists = any(
-                    (m['team1']['team_name'] == team1_data['team_name'] and
-                     m['team2']['team_name'] == team2_data['team_name']) or
-                    (m['team1']['team_name'] == team2_data['team_name'] and
-                     m['team2']['team_name'] == team1_data['team_name'])
-                    for m in st.session_state.playoff_matchups[matchup_week]
-                )
-
-                if exists:
+                # The store rejects a matchup that already exists for this week
+                added = add_playoff_matchup(matchup_week, team1_data, team2_data)
+                if added is False:
                     st.warning(f"This matchup already exists for week {matchup_week}!")
-                else:
-                    st.session_state.playoff_matchups[matchup_week].append({
-                        'team1': team1_data,
-                        'team2': team2_data
-                    })
-                    # Save to file after creating matchup
-                    if save_matchups_to_file(st.session_state.playoff_matchups):
-                        st.success(
-                            f"Created matchup for week {matchup_week}: {team1_data['team_name']} vs {team2_data['team_name']}")
-                        st.rerun()
+                elif added:
+                    st.success(
+                        f"Created matchup for week {matchup_week}: {team1_data['team_name']} vs {team2_data['team_name']}")
+                    st.rerun()
 
     # Display existing matchups
     st.markdown("---")
     st.subheader("🏆 Playoff Matchups")
 
-    if not st.session_state.playoff_matchups or all(
-            len(matchups) == 0 for matchups in st.session_state.playoff_matchups.values()):
+    if not playoff_matchups:
         st.info("No matchups created yet. Create one above to get started!")
     else:
         current_week = get_current_week()
 
         # Week selector for viewing different weeks
         all_weeks_with_matchups = sorted(
-            [week for week, matchups in st.session_state.playoff_matchups.items() if matchups])
+            [week for week, matchups in playoff_matchups.items() if matchups])
 
         if not all_weeks_with_matchups:
             st.info("No matchups created yet. Create one above to get started!")
@@ -210,7 +126,7 @@ def render_playoffs_tab():
             playoff_df = calculate_playoff_standings(standings_df, matchups_df)
 
         # Display matchups for selected week
-        week_matchups = st.session_state.playoff_matchups.get(selected_week, [])
+        week_matchups = playoff_matchups.get(selected_week, [])
 
         if not week_matchups:
             st.info(f"No matchups for week {selected_week}")
@@ -220,23 +136,11 @@ def render_playoffs_tab():
             team1 = matchup['team1']
             team2 = matchup['team2']
 
-            # Get team logos
-            team1_logo = ""
-            team2_logo = ""
-
-            league1_data = fetch_league_data(team1['league_id'])
-            if league1_data and 'teams' in league1_data:
-                for team in league1_data['teams']:
-                    if team.get('id') == team1['team_id']:
-                        team1_logo = team.get('logo', '')
-                        break
-
-            league2_data = fetch_league_data(team2['league_id'])
-            if league2_data and 'teams' in league2_data:
-                for team in league2_data['teams']:
-                    if team.get('id') == team2['team_id']:
-                        team2_logo = team.get('logo', '')
-                        break
+            # Get team logos and owners
+            team1_info = get_team(team1['league_id'], team1['team_id'])
+            team2_info = get_team(team2['league_id'], team2['team_id'])
+            team1_logo = get_thumbnail(team1_info.logo) if team1_info else ""
+            team2_logo = get_thumbnail(team2_info.logo) if team2_info else ""
 
             # Get seeds from playoff standings
             team1_seed = "N/A"
@@ -254,8 +158,8 @@ def render_playoffs_tab():
                     team2_seed = int(team2_row.iloc[0]['Rank'])
 
             # Get scores for selected week
-            team1_score = get_team_score_for_week(team1['league_id'], team1['team_name'], selected_week)
-            team2_score = get_team_score_for_week(team2['league_id'], team2['team_name'], selected_week)
+            team1_score = get_team_score_for_week(team1['league_id'], team1['team_id'], selected_week)
+            team2_score = get_team_score_for_week(team2['league_id'], team2['team_id'], selected_week)
 
             # Determine winner
             team1_winning = False
@@ -266,9 +170,8 @@ def render_playoffs_tab():
                 elif team2_score > team1_score:
                     team2_winning = True
 
-            # Get owner names
-            team1_owner = TEAM_OWNERS.get(team1['team_name'], "")
-            team2_owner = TEAM_OWNERS.get(team2['team_name'], "")
+            team1_owner = team1_info.owner if team1_info else ""
+            team2_owner = team2_info.owner if team2_info else ""
 
             with st.container(border=True):
                 # Matchup header with delete button
@@ -276,10 +179,8 @@ def render_playoffs_tab():
                 with col_header:
                     st.markdown(f"### Matchup {idx + 1}")
                 with col_delete:
-                    if st.button("🗑", key=f"delete_{selected_week}_{idx}", help="Delete this matchup"):
-                        st.session_state.playoff_matchups[selected_week].pop(idx)
-                        # Save to file after deleting matchup
-                        save_matchups_to_file(st.session_state.playoff_matchups)
+                    if st.button("🗑", key=f"delete_{matchup['id']}", help="Delete this matchup"):
+                        delete_playoff_matchup(matchup['id'])
                         st.rerun()
 
                 # Team 1
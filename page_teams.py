@@ -1,6 +1,7 @@
 from utils import *
 
 
+@timed()
 def render_teams_tab():
     st.markdown("")
 
@@ -18,21 +19,15 @@ def render_teams_tab():
         selected_idx = team_options.index(selected_team_display)
         selected_team = all_teams[selected_idx]
 
-        league_data = fetch_league_data(selected_team['league_id'])
+        league = get_league_data(selected_team['league_id'])
+        team_info = league.teams.get(selected_team['team_id']) if league else None
 
-        # Get owner names
-        owner = TEAM_OWNERS.get(selected_team['team_name'], "")
+        # Get owner name and team logo
+        owner = team_info.owner if team_info else ""
+        team_logo = get_thumbnail(team_info.logo) if team_info else ""
 
-        if league_data:
-            roster = get_team_roster(league_data, selected_team['team_id'])
-
-            # Get team logo
-            team_logo = ""
-            if 'teams' in league_data:
-                for team in league_data['teams']:
-                    if team.get('id') == selected_team['team_id']:
-                        team_logo = team.get('logo', '')
-                        break
+        if league:
+            roster = get_team_roster(league, selected_team['team_id'])
 
             standings_df = fetch_all_leagues()
             matchups_df = fetch_all_matchups()
@@ -129,46 +124,28 @@ def render_teams_tab():
             st.markdown("---")
             st.subheader("Results")
 
-            if league_data and 'schedule' in league_data:
-                schedule = league_data.get('schedule', [])
-                teams = league_data.get('teams', [])
-                team_map = {team.get('id'): team.get('name', 'Unknown') for team in teams}
-                logo_map = {team.get('id'): team.get('logo', '') for team in teams}
-                current_week = league_data.get('scoringPeriodId', 1)
+            if league and league.schedule:
+                current_week = league.current_week
+                team_id = selected_team['team_id']
 
                 # Filter schedule for selected team
                 team_schedule = []
-                for matchup in schedule:
-                    home = matchup.get('home', {})
-                    away = matchup.get('away', {})
-
-                    if not away:  # Skip bye weeks
+                for matchup in league.schedule:
+                    if matchup.away_id is None:  # Skip bye weeks
                         continue
 
-                    home_team_id = home.get('teamId')
-                    away_team_id = away.get('teamId')
-                    home_team_name = team_map.get(home_team_id, 'Unknown')
-                    away_team_name = team_map.get(away_team_id, 'Unknown')
-
                     # Check if selected team is in this matchup
-                    if home_team_name == selected_team['team_name'] or away_team_name == selected_team['team_name']:
-                        week = matchup.get('matchupPeriodId')
-                        is_home = home_team_name == selected_team['team_name']
-                        opponent_name = away_team_name if is_home else home_team_name
-                        opponent_id = away_team_id if is_home else home_team_id
-                        opponent_logo = logo_map.get(opponent_id, '')
-
-                        # Get scores
-                        if week == current_week:
-                            team_score = round(home.get('totalPointsLive', 0), 1) if is_home else round(
-                                away.get('totalPointsLive', 0), 1)
-                            opp_score = round(away.get('totalPointsLive', 0), 1) if is_home else round(
-                                home.get('totalPointsLive', 0), 1)
-                        else:
-                            team_score = round(home.get('totalPoints', 0), 1) if is_home else round(
-                                away.get('totalPoints', 0), 1)
-                            opp_score = round(away.get('totalPoints', 0), 1) if is_home else round(
-                                home.get('totalPoints', 0), 1)
+                    if team_id in (matchup.home_id, matchup.away_id):
+                        week = matchup.week
+                        is_home = matchup.home_id == team_id
+                        opponent_id = matchup.away_id if is_home else matchup.home_id
+                        opponent = league.teams.get(opponent_id)
+                        opponent_name = league.team_name(opponent_id)
+                        opponent_logo = get_thumbnail(opponent.logo) if opponent else ''
+
+                        # Scores are already live for the current week and final otherwise
+                        team_score = matchup.home_score if is_home else matchup.away_score
+                        opp_score = matchup.away_score if is_home else matchup.home_score
 
                         # Determine result
                         if week <= current_week:
@@ -188,7 +165,7 @@ def render_teams_tab():
                             opp_score = "-"
 
                         # Get opponent owner
-                        opponent_owner = TEAM_OWNERS.get(opponent_name, "")
+                        opponent_owner = opponent.owner if opponent else ""
 
                         team_schedule.append({
                             'Week': week,
@@ -0,0 +1,64 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Each script thread records the spans of its current rerun here
+_local = threading.local()
+
+
+def start_trace():
+    """Start collecting spans for the current rerun on this thread and return the span list"""
+    _local.trace = []
+    return _local.trace
+
+
+def current_trace():
+    """Get the span list being collected on this thread, or None outside a rerun"""
+    return getattr(_local, 'trace', None)
+
+
+def bind(func):
+    """Wrap func so spans it records on a worker thread land in the caller's trace"""
+    trace = current_trace()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = current_trace()
+        _local.trace = trace
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.trace = previous
+
+    return wrapper
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time a block and record it in the current trace; set 'bytes' or 'cache_hit' on the yielded dict"""
+    record = {'name': name, 'thread': threading.current_thread().name, **attrs}
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['ms'] = (time.perf_counter() - start) * 1000
+        trace = current_trace()
+        if trace is not None:
+            # list.append is atomic, so worker threads can share the trace
+            trace.append(record)
+
+
+def timed(name=None):
+    """Decorator recording a span around every call of the function"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
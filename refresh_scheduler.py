@@ -0,0 +1,170 @@
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+# Seconds between refreshes while NFL games are in progress
+LIVE_INTERVAL = 60
+
+# Seconds between refreshes on a game day with nothing in progress
+GAME_DAY_INTERVAL = 60 * 60
+
+# Seconds between refreshes with no game in sight
+IDLE_INTERVAL = 24 * 60 * 60
+
+# A kickoff within this many seconds makes it a game day
+GAME_DAY_WINDOW = 12 * 60 * 60
+
+# Each interval is randomly stretched or shrunk by up to this fraction
+JITTER = 0.1
+
+
+class RequestBudget:
+    """Sliding one-minute window of upstream requests shared by every caller"""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._sent and now - self._sent[0] >= 60:
+            self._sent.popleft()
+
+    def record(self, count=1):
+        """Count requests that are being sent now"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._sent.extend([now] * count)
+
+    def remaining(self):
+        """Get how many requests still fit in the current minute"""
+        with self._lock:
+            self._expire(time.monotonic())
+            return max(self.per_minute - len(self._sent), 0)
+
+    def wait_time(self, count):
+        """Get the seconds until count more requests fit in the budget"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            over = len(self._sent) + count - self.per_minute
+            if over <= 0:
+                return 0
+            if over > len(self._sent):
+                # More than a minute's budget; wait for the window to clear
+                return 60
+            return 60 - (now - self._sent[over - 1])
+
+
+def _parse_kickoff(date):
+    return datetime.fromisoformat(date.replace('Z', '+00:00'))
+
+
+def game_window(scoreboard, now=None):
+    """Classify an ESPN NFL scoreboard as 'live', 'game_day' or 'idle' and get the next kickoff, if any"""
+    now = now or datetime.now(timezone.utc)
+    next_kickoff = None
+    for event in scoreboard.get('events', []):
+        state = event.get('status', {}).get('type', {}).get('state')
+        if state == 'in':
+            return 'live', None
+        if state == 'pre' and event.get('date'):
+            kickoff = _parse_kickoff(event['date'])
+            if kickoff > now and (next_kickoff is None or kickoff < next_kickoff):
+                next_kickoff = kickoff
+
+    if next_kickoff is not None and (next_kickoff - now).total_seconds() <= GAME_DAY_WINDOW:
+        return 'game_day', next_kickoff
+    return 'idle', next_kickoff
+
+
+def poll_interval(state, next_kickoff=None, now=None, jitter=JITTER, rng=random):
+    """Get the seconds until the next refresh for a game window, waking up for the next kickoff"""
+    interval = {'live': LIVE_INTERVAL, 'game_day': GAME_DAY_INTERVAL}.get(state, IDLE_INTERVAL)
+    if next_kickoff is not None:
+        now = now or datetime.now(timezone.utc)
+        interval = min(interval, max((next_kickoff - now).total_seconds(), LIVE_INTERVAL))
+    return interval * rng.uniform(1 - jitter, 1 + jitter)
+
+
+class RefreshScheduler:
+    """Background thread that refreshes data often during NFL games and rarely otherwise
+
+    fetch_scoreboard() returns the ESPN NFL scoreboard used to pick the next
+    interval; refresh() costs requests_per_refresh upstream requests and waits
+    until the shared budget has room for them.
+    """
+
+    def __init__(self, refresh, fetch_scoreboard, budget, requests_per_refresh, rng=None):
+        self.refresh = refresh
+        self.fetch_scoreboard = fetch_scoreboard
+        self.budget = budget
+        self.requests_per_refresh = requests_per_refresh
+        self._rng = rng or random.Random()
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {'state': None, 'next_refresh_at': None, 'refreshes': 0, 'refresh_errors': 0,
+                       'budget_waits': 0, 'scoreboard_errors': 0}
+
+    def start(self):
+        """Start the scheduler thread unless it is already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread after its current step"""
+        self._stop.set()
+
+    def stats(self):
+        """Get the current game window, seconds to the next refresh and refresh counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        next_refresh_at = stats.pop('next_refresh_at')
+        stats['next_refresh_in'] = None if next_refresh_at is None else max(next_refresh_at - time.monotonic(), 0)
+        stats['budget_remaining'] = self.budget.remaining()
+        return stats
+
+    def _count(self, counter):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _next_interval(self):
+        try:
+            state, next_kickoff = game_window(self.fetch_scoreboard())
+        except Exception:
+            # Without a scoreboard, poll as if it were a game day
+            self._count('scoreboard_errors')
+            state, next_kickoff = 'unknown', None
+            return state, GAME_DAY_INTERVAL * self._rng.uniform(1 - JITTER, 1 + JITTER)
+        return state, poll_interval(state, next_kickoff, rng=self._rng)
+
+    def _run(self):
+        while not self._stop.is_set():
+            state, interval = self._next_interval()
+            with self._lock:
+                self._stats['state'] = state
+                self._stats['next_refresh_at'] = time.monotonic() + interval
+            if self._stop.wait(interval):
+                return
+
+            wait = self.budget.wait_time(self.requests_per_refresh)
+            if wait:
+                # Foreground fetches used the budget; go once it has room again
+                self._count('budget_waits')
+                if self._stop.wait(wait):
+                    return
+
+            try:
+                self.refresh()
+                self._count('refreshes')
+            except Exception:
+                # Keep the schedule going; stale data is still served meanwhile
+                self._count('refresh_errors')
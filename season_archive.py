@@ -0,0 +1,288 @@
+"""Archive past seasons of every league and query them without touching ESPN.
+
+Pull each past season of every league once (seasons already archived are skipped):
+
+    python season_archive.py ingest
+
+Re-pull specific seasons:
+
+    python season_archive.py ingest --seasons 2023 2024 --force
+
+Query the archive:
+
+    python season_archive.py records
+    python season_archive.py champions
+    python season_archive.py best-weeks --limit 10 --playoffs only
+"""
+import argparse
+import glob
+import os
+import threading
+
+import pandas as pd
+import requests
+
+from league_extract import extract_league
+
+try:
+    import pyarrow  # noqa: F401
+    _FORMAT = 'parquet'
+except ImportError:
+    # Without pyarrow, tables are stored as pickled DataFrames
+    _FORMAT = 'pkl'
+
+ARCHIVE_DIR = "season_archive"
+
+# Earliest season the ESPN v3 API serves league data for
+FIRST_SEASON = 2018
+
+# One request per league and season; mTeam carries members and final ranks
+ARCHIVE_VIEWS = ['mTeam', 'mMatchupScore']
+
+_SIDE_FIELDS = {'teamId': True, 'totalPoints': True}
+ARCHIVE_FIELDS = {
+    'members': {'id': True, 'displayName': True, 'firstName': True, 'lastName': True},
+    'teams': {
+        'id': True,
+        'name': True,
+        'primaryOwner': True,
+        'rankCalculatedFinal': True,
+        'record': {'overall': {'wins': True, 'losses': True, 'ties': True, 'pointsFor': True, 'pointsAgainst': True}}
+    },
+    'schedule': {'matchupPeriodId': True, 'playoffTierType': True, 'home': _SIDE_FIELDS, 'away': _SIDE_FIELDS}
+}
+
+# Column dtypes of the archived tables, so empty and all-null columns still aggregate as numbers
+TEAM_DTYPES = {
+    'season': 'int64', 'league': 'object', 'team_id': 'int64', 'team': 'object', 'owner_id': 'object',
+    'owner': 'object', 'wins': 'int64', 'losses': 'int64', 'ties': 'int64', 'points_for': 'float64',
+    'points_against': 'float64', 'final_rank': 'float64'
+}
+WEEK_DTYPES = {
+    'season': 'int64', 'league': 'object', 'week': 'int64', 'playoffs': 'bool', 'team_id': 'int64',
+    'team': 'object', 'owner_id': 'object', 'owner': 'object', 'score': 'float64', 'opponent': 'object',
+    'opponent_score': 'float64'
+}
+
+
+def _extract_archive(stream):
+    return extract_league(stream, fields=ARCHIVE_FIELDS)
+
+
+def _owner_name(member):
+    name = f"{member.get('firstName', '')} {member.get('lastName', '')}".strip()
+    return name or member.get('displayName', 'Unknown')
+
+
+def _table(rows, dtypes):
+    return pd.DataFrame(rows, columns=list(dtypes)).astype(dtypes)
+
+
+def archive_tables(data, season, league):
+    """Flatten a season's league payload into (teams, team-week scores) DataFrames"""
+    owners = {member['id']: _owner_name(member) for member in data.get('members', [])}
+    teams = {}
+    team_rows = []
+    for team in data.get('teams', []):
+        owner_id = team.get('primaryOwner')
+        record = team.get('record', {}).get('overall', {})
+        teams[team['id']] = (team.get('name', f"Team {team['id']}"), owner_id, owners.get(owner_id, 'Unknown'))
+        team_rows.append((season, league, team['id'], *teams[team['id']],
+                          record.get('wins', 0), record.get('losses', 0), record.get('ties', 0),
+                          record.get('pointsFor', 0.0), record.get('pointsAgainst', 0.0),
+                          team.get('rankCalculatedFinal') or None))
+
+    week_rows = []
+    for entry in data.get('schedule', []):
+        home, away = entry.get('home'), entry.get('away')
+        if not home or not away:
+            # Byes have no opponent and are left out, as on the dashboard
+            continue
+        playoffs = entry.get('playoffTierType', 'NONE') != 'NONE'
+        for side, other in ((home, away), (away, home)):
+            name, owner_id, owner = teams.get(side['teamId'], (f"Team {side['teamId']}", None, 'Unknown'))
+            week_rows.append((season, league, entry['matchupPeriodId'], playoffs, side['teamId'], name, owner_id,
+                              owner, side.get('totalPoints', 0.0),
+                              teams.get(other['teamId'], (f"Team {other['teamId']}",))[0],
+                              other.get('totalPoints', 0.0)))
+
+    return _table(team_rows, TEAM_DTYPES), _table(week_rows, WEEK_DTYPES)
+
+
+def _table_path(directory, season, league, table):
+    return os.path.join(directory, str(season), f"{league}.{table}.{_FORMAT}")
+
+
+def _write_table(df, path):
+    """Write a table atomically so readers never see half a file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if _FORMAT == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_table(path):
+    return pd.read_parquet(path) if _FORMAT == 'parquet' else pd.read_pickle(path)
+
+
+def ingest(seasons=None, leagues=None, directory=ARCHIVE_DIR, force=False):
+    """Fetch and archive each (season, league) not archived yet; get {(season, league): status}
+
+    Seasons default to every past one; the current season stays live on the
+    dashboard. A season a league didn't exist in (404) is archived empty so it
+    isn't asked for again.
+    """
+    # Loaded lazily so queries never pull in the HTTP session and its settings
+    import utils
+
+    seasons = seasons or range(FIRST_SEASON, utils.SEASON)
+    leagues = leagues or utils.LEAGUES
+    results = {}
+    for season in seasons:
+        for league, league_id in leagues.items():
+            teams_path = _table_path(directory, season, league, 'teams')
+            if not force and os.path.exists(teams_path):
+                results[(season, league)] = 'archived'
+                continue
+
+            try:
+                data = utils.request_league_season(league_id, ARCHIVE_VIEWS, season, extract=_extract_archive)
+                status = 'ingested'
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    results[(season, league)] = f"failed: {e}"
+                    continue
+                data, status = {}, 'missing'
+            except requests.exceptions.RequestException as e:
+                results[(season, league)] = f"failed: {e}"
+                continue
+
+            teams, weeks = archive_tables(data, season, league)
+            # Weeks first: a teams file marks the season as archived
+            _write_table(weeks, _table_path(directory, season, league, 'weeks'))
+            _write_table(teams, teams_path)
+            results[(season, league)] = status
+    return results
+
+
+class SeasonArchive:
+    """Read-only view of the archive, loaded into memory once and reloaded only when its files change"""
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self._cache = (None, None, None)
+        self._lock = threading.Lock()
+
+    def _signature(self):
+        paths = sorted(glob.glob(os.path.join(self.directory, "*", f"*.{_FORMAT}")))
+        return tuple((path, os.path.getmtime(path)) for path in paths)
+
+    def _tables(self):
+        """Get the archived (teams, weeks) across all seasons and leagues"""
+        with self._lock:
+            signature = self._signature()
+            cached_signature, teams, weeks = self._cache
+            if cached_signature == signature:
+                return teams, weeks
+
+            frames = {'teams': [], 'weeks': []}
+            for path, _ in signature:
+                table = os.path.basename(path).split('.')[-2]
+                df = _read_table(path)
+                if not df.empty:
+                    frames[table].append(df)
+            # An empty archive (nothing ingested yet, or only missing seasons) still has numeric columns
+            teams = pd.concat(frames['teams'], ignore_index=True) if frames['teams'] else _table([], TEAM_DTYPES)
+            weeks = pd.concat(frames['weeks'], ignore_index=True) if frames['weeks'] else _table([], WEEK_DTYPES)
+            self._cache = (signature, teams, weeks)
+            return teams, weeks
+
+    def seasons(self):
+        """Get the archived seasons with at least one league, oldest first"""
+        teams, _ = self._tables()
+        return sorted(int(season) for season in teams['season'].unique())
+
+    def all_time_records(self, league=None):
+        """Get each owner's combined record, titles and best finish across archived seasons"""
+        teams, _ = self._tables()
+        if league is not None:
+            teams = teams[teams['league'] == league]
+        teams = teams.assign(title=teams['final_rank'] == 1)
+        records = teams.groupby('owner_id', sort=False).agg(
+            owner=('owner', 'last'), seasons=('season', 'nunique'), wins=('wins', 'sum'),
+            losses=('losses', 'sum'), ties=('ties', 'sum'), points_for=('points_for', 'sum'),
+            points_against=('points_against', 'sum'), titles=('title', 'sum'), best_finish=('final_rank', 'min')
+        )
+        games = records['wins'] + records['losses'] + records['ties']
+        records['win_pct'] = ((records['wins'] + records['ties'] / 2) / games.where(games > 0)).round(3)
+        records['points_for'] = records['points_for'].round(2)
+        records['points_against'] = records['points_against'].round(2)
+        return records.sort_values(['wins', 'points_for'], ascending=False).reset_index(drop=True)
+
+    def champions(self, league=None):
+        """Get each archived season's league champions, newest first"""
+        teams, _ = self._tables()
+        champions = teams[teams['final_rank'] == 1]
+        if league is not None:
+            champions = champions[champions['league'] == league]
+        return champions[['season', 'league', 'team', 'owner', 'wins', 'losses', 'points_for']] \
+            .sort_values(['season', 'league'], ascending=[False, True]).reset_index(drop=True)
+
+    def best_weeks(self, limit=10, season=None, league=None, playoffs=None):
+        """Get the highest single-week scores, optionally for one season, league or only (non-)playoff weeks"""
+        _, weeks = self._tables()
+        if season is not None:
+            weeks = weeks[weeks['season'] == season]
+        if league is not None:
+            weeks = weeks[weeks['league'] == league]
+        if playoffs is not None:
+            weeks = weeks[weeks['playoffs'] == playoffs]
+        return weeks.nlargest(limit, 'score')[
+            ['season', 'league', 'week', 'team', 'owner', 'score', 'opponent', 'opponent_score']
+        ].round({'score': 2, 'opponent_score': 2}).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive past seasons or query the archive")
+    parser.add_argument('--dir', default=ARCHIVE_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="Fetch past seasons not archived yet")
+    ingest_parser.add_argument('--seasons', type=int, nargs='+', default=None)
+    ingest_parser.add_argument('--force', action='store_true', help="Re-fetch seasons that are already archived")
+
+    records_parser = subparsers.add_parser('records', help="All-time records by owner")
+    records_parser.add_argument('--league', default=None)
+
+    champions_parser = subparsers.add_parser('champions', help="Past champions")
+    champions_parser.add_argument('--league', default=None)
+
+    best_parser = subparsers.add_parser('best-weeks', help="Highest single-week scores")
+    best_parser.add_argument('--limit', type=int, default=10)
+    best_parser.add_argument('--season', type=int, default=None)
+    best_parser.add_argument('--league', default=None)
+    best_parser.add_argument('--playoffs', choices=['all', 'only', 'exclude'], default='all',
+                             help="Whether to rank playoff weeks too, only them, or only regular-season weeks")
+
+    args = parser.parse_args()
+    if args.command == 'ingest':
+        for (season, league), status in ingest(args.seasons, directory=args.dir, force=args.force).items():
+            print(f"{season} {league}: {status}")
+        return
+
+    archive = SeasonArchive(args.dir)
+    if args.command == 'records':
+        result = archive.all_time_records(args.league)
+    elif args.command == 'champions':
+        result = archive.champions(args.league)
+    else:
+        playoffs = {'all': None, 'only': True, 'exclude': False}[args.playoffs]
+        result = archive.best_weeks(args.limit, args.season, args.league, playoffs)
+    print(result.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
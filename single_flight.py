@@ -0,0 +1,70 @@
+import threading
+from collections import deque
+
+from perf import span
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error', 'completed', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.completed = False
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; callers arriving meanwhile wait and share its result"""
+
+    def __init__(self, history=50):
+        self._flights = {}
+        self._lock = threading.Lock()
+        # (key, waiters) for the most recent finished calls
+        self._recent = deque(maxlen=history)
+        self._stats = {'calls': 0, 'waiters': 0, 'max_waiters': 0}
+
+    def do(self, key, func):
+        """Return func(), or the result of the call already running for key"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+
+        if not leader:
+            with span('single_flight_wait', key=str(key)):
+                flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if not flight.completed:
+                # The leading thread was stopped mid-call; make the call ourselves
+                return self.do(key, func)
+            return flight.result
+
+        try:
+            flight.result = func()
+            flight.completed = True
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                self._stats['calls'] += 1
+                self._stats['waiters'] += flight.waiters
+                self._stats['max_waiters'] = max(self._stats['max_waiters'], flight.waiters)
+                self._recent.append((key, flight.waiters))
+            flight.done.set()
+
+    def stats(self):
+        """Get call and waiter counters plus the waiters that joined each recent call"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._flights)
+            stats['recent'] = [{'key': str(key), 'waiters': waiters} for key, waiters in self._recent]
+        return stats
@@ -0,0 +1,55 @@
+import glob
+import gzip
+import json
+import os
+import time
+
+SNAPSHOT_DIR = "snapshots"
+
+# Number of snapshots kept per league; older ones are deleted on save
+SNAPSHOT_RETENTION = 10
+
+
+def _league_dir(season, league_id):
+    # League ids carry over between seasons, so each season keeps its own snapshots
+    return os.path.join(SNAPSHOT_DIR, str(season), str(league_id))
+
+
+def _snapshot_paths(season, league_id):
+    """List a league's snapshot files for a season, oldest first"""
+    return sorted(glob.glob(os.path.join(_league_dir(season, league_id), "*.json.gz")))
+
+
+def save_snapshot(season, league_id, payload):
+    """Write a league's payload for a season to a compressed, timestamped snapshot file"""
+    league_dir = _league_dir(season, league_id)
+    os.makedirs(league_dir, exist_ok=True)
+
+    saved_at = time.time()
+    path = os.path.join(league_dir, f"{saved_at:.3f}.json.gz")
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(payload, f, separators=(',', ':'))
+    # Readers never see a partially written snapshot
+    os.replace(tmp_path, path)
+
+    for old_path in _snapshot_paths(season, league_id)[:-SNAPSHOT_RETENTION]:
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass
+    return path
+
+
+def load_latest_snapshot(season, league_id):
+    """Load a league's most recent snapshot for a season as (payload, saved_at), or None if there isn't one"""
+    for path in reversed(_snapshot_paths(season, league_id)):
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            # Skip corrupt snapshots and fall back to the one before
+            continue
+        saved_at = float(os.path.basename(path)[:-len(".json.gz")])
+        return payload, saved_at
+    return None
@@ -0,0 +1,24 @@
+import os
+import shutil
+import sys
+import tempfile
+
+# The app is a flat set of modules run from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot_store  # noqa: E402
+import week_store  # noqa: E402
+
+# Keep the app's on-disk state out of the checkout: point it at a scratch
+# directory before utils is imported by any test module
+_STATE_DIR = tempfile.mkdtemp(prefix='sbs-dash-tests-')
+snapshot_store.SNAPSHOT_DIR = os.path.join(_STATE_DIR, 'snapshots')
+week_store.WEEK_STORE_DIR = os.path.join(_STATE_DIR, 'finalized_weeks')
+
+import utils  # noqa: E402
+
+utils._FINAL_WEEKS = week_store.FinalizedWeekStore(utils.parse_matchup, week_store.WEEK_STORE_DIR)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_STATE_DIR, ignore_errors=True)
@@ -0,0 +1,39 @@
+import pytest
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('espn', failure_threshold=2, reset_after=60)
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()['state'] == 'open'
+
+
+def test_half_open_allows_one_trial():
+    breaker = CircuitBreaker('espn', failure_threshold=1, reset_after=0)
+    breaker.record_failure()
+
+    breaker.before_call()
+    assert breaker.stats()['state'] == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_trial_outcome_closes_or_reopens():
+    breaker = CircuitBreaker('espn', failure_threshold=1, reset_after=0)
+    breaker.record_failure()
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.stats()['state'] == 'open'
+
+    # reset_after has passed again, so the next call is a new trial
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.stats() == {'state': 'closed', 'consecutive_failures': 0, 'opened': 2, 'rejected': 0}
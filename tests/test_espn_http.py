@@ -0,0 +1,121 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from espn_http import ESPNSession
+from league_extract import extract_league
+
+BODY = b'{"id": 1, "scoringPeriodId": 3, "teams": [{"id": 1, "name": "A"}], "schedule": []}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    # Each test sets the responses its server gives, in order; the last one repeats
+    responses = []
+
+    def do_GET(self):
+        status, headers, body = self.server.responses[min(self.server.calls, len(self.server.responses) - 1)]
+        self.server.calls += 1
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.responses = [(200, {'Content-Length': str(len(BODY))}, BODY)]
+    httpd.calls = 0
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/league"
+
+
+def truncated(body=BODY):
+    # Promises the whole body but sends half of it before closing
+    return 200, {'Content-Length': str(len(body)), 'Connection': 'close'}, body[:len(body) // 2]
+
+
+@pytest.mark.parametrize('extract', [None, extract_league])
+def test_truncated_body_raises_a_request_exception(server, extract):
+    server.responses = [truncated()]
+    session = ESPNSession(timeout=2, retries=1, backoff=0)
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        session.get_json(url(server), extract=extract)
+    # A dropped connection is retried like any other network error
+    assert server.calls == 2
+
+
+def test_truncated_body_is_retried(server):
+    server.responses = [truncated(), (200, {'Content-Length': str(len(BODY))}, BODY)]
+    session = ESPNSession(timeout=2, retries=1, backoff=0)
+
+    assert session.get_json(url(server), extract=extract_league)['scoringPeriodId'] == 3
+
+
+@pytest.mark.parametrize('extract', [None, extract_league])
+def test_invalid_json_raises_a_request_exception(server, extract):
+    body = b'<html>Service Unavailable</html>'
+    server.responses = [(200, {'Content-Length': str(len(body))}, body)]
+    session = ESPNSession(timeout=2, retries=1, backoff=0)
+
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        session.get_json(url(server), extract=extract)
+    assert server.calls == 1
+
+
+def test_failed_half_open_trial_lets_the_next_trial_through(server):
+    server.responses = [(503, {'Content-Length': '0'}, b''), (200, {'Content-Length': str(len(BODY))}, BODY)]
+    session = ESPNSession(timeout=2, retries=0, failure_threshold=1, reset_after=0)
+    trials = []
+
+    def extract(stream):
+        trials.append(None)
+        if len(trials) == 1:
+            raise RuntimeError("decoder bug")
+        return extract_league(stream)
+
+    # The 503 opens the circuit and the half-open trial fails with a non-request error
+    with pytest.raises(requests.exceptions.HTTPError):
+        session.get_json(url(server), extract=extract)
+    with pytest.raises(RuntimeError):
+        session.get_json(url(server), extract=extract)
+
+    assert session.get_json(url(server), extract=extract)['id'] == 1
+    assert session.stats()['127.0.0.1']['circuit']['state'] == 'closed'
+
+
+def test_long_retry_after_gives_up_instead_of_retrying_early(server, monkeypatch):
+    server.responses = [(429, {'Retry-After': '60', 'Content-Length': '0'}, b'')]
+    sleeps = []
+    monkeypatch.setattr('espn_http.time.sleep', sleeps.append)
+    session = ESPNSession(timeout=2, retries=2, max_backoff=4)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        session.get_json(url(server))
+    assert server.calls == 1
+    assert sleeps == []
+
+
+def test_short_retry_after_is_honoured(server, monkeypatch):
+    server.responses = [(503, {'Retry-After': '3', 'Content-Length': '0'}, b''),
+                        (200, {'Content-Length': str(len(BODY))}, BODY)]
+    sleeps = []
+    monkeypatch.setattr('espn_http.time.sleep', sleeps.append)
+    session = ESPNSession(timeout=2, retries=2, max_backoff=4)
+
+    assert session.get_json(url(server))['id'] == 1
+    assert sleeps == [3.0]
@@ -0,0 +1,42 @@
+import io
+import json
+
+import utils
+from league_extract import extract_league
+
+PAYLOAD = {
+    'id': 1,
+    'scoringPeriodId': 5,
+    'status': {'currentMatchupPeriod': 5},
+    'settings': {'name': 'Doinks'},
+    'teams': [{
+        'id': 1,
+        'name': 'A',
+        'record': {'overall': {'wins': 3, 'losses': 1, 'pointsFor': 410.5, 'pointsAgainst': 380.0}},
+        'roster': {'entries': [
+            {'lineupSlotId': slot, 'playerPoolEntry': {'player': {'fullName': f"Player {slot}", 'proTeamId': 12}}}
+            for slot in (0, 17, 18, 20, 21)
+        ]}
+    }],
+    'schedule': [{'matchupPeriodId': 1, 'playoffTierType': 'NONE',
+                  'home': {'teamId': 1, 'totalPoints': 101.5, 'rosterForMatchupPeriod': {}}}]
+}
+
+
+def rosters(league):
+    return {team_id: [(p.name, p.position, p.nfl_team) for p in players]
+            for team_id, players in league.rosters.items()}
+
+
+def test_streamed_and_full_decodes_parse_the_same():
+    body = json.dumps(PAYLOAD).encode()
+    streamed = utils.parse_league(extract_league(io.BytesIO(body)))
+    decoded = utils.parse_league(json.loads(body))
+
+    assert rosters(streamed) == rosters(decoded)
+    assert streamed.teams[1].wins == decoded.teams[1].wins
+
+
+def test_rosters_keep_only_the_shown_slots():
+    league = utils.parse_league(PAYLOAD)
+    assert [position for _, position, _ in rosters(league)[1]] == ['QB', 'K', 'P']
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from matchup_store import MatchupStore
+
+TEAM_A = {'league_id': 1, 'team_id': 1, 'name': 'A'}
+TEAM_B = {'league_id': 1, 'team_id': 2, 'name': 'B'}
+TEAM_C = {'league_id': 2, 'team_id': 1, 'name': 'C'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MatchupStore(str(tmp_path / 'matchups.db'), str(tmp_path / 'matchups.json'))
+
+
+def test_add_and_load(store):
+    first = store.add(15, TEAM_A, TEAM_B)
+    second = store.add(15, TEAM_A, TEAM_C)
+
+    assert store.load() == {15: [{'id': first, 'team1': TEAM_A, 'team2': TEAM_B},
+                                 {'id': second, 'team1': TEAM_A, 'team2': TEAM_C}]}
+
+
+def test_duplicate_pair_is_ignored_without_a_version_bump(store):
+    store.add(15, TEAM_A, TEAM_B)
+    version = store.version()
+
+    assert store.add(15, TEAM_B, TEAM_A) is None
+    assert store.version() == version
+    # The same teams may still meet in another week
+    assert store.add(16, TEAM_B, TEAM_A) is not None
+
+
+def test_delete(store):
+    matchup_id = store.add(15, TEAM_A, TEAM_B)
+    version = store.version()
+
+    assert store.delete(matchup_id) is True
+    assert store.version() == version + 1
+    assert store.delete(matchup_id) is False
+    assert store.version() == version + 1
+    assert store.load() == {}
+
+
+def test_load_is_cached_until_a_write(store):
+    store.add(15, TEAM_A, TEAM_B)
+    loaded = store.load()
+    assert store.load() is loaded
+
+    store.add(15, TEAM_A, TEAM_C)
+    assert store.load() is not loaded
+
+
+def test_writes_from_another_connection_are_seen(store):
+    store.add(15, TEAM_A, TEAM_B)
+    store.load()
+
+    MatchupStore(store.path, store.legacy_file).add(15, TEAM_A, TEAM_C)
+    assert len(store.load()[15]) == 2
+
+
+def test_legacy_file_is_imported_once(tmp_path):
+    legacy_file = tmp_path / 'matchups.json'
+    legacy_file.write_text(json.dumps({'15': [{'team1': TEAM_A, 'team2': TEAM_B}]}))
+    db_path = str(tmp_path / 'matchups.db')
+
+    store = MatchupStore(db_path, str(legacy_file))
+    assert [(m['team1'], m['team2']) for m in store.load()[15]] == [(TEAM_A, TEAM_B)]
+    store.delete(store.load()[15][0]['id'])
+
+    # A later process doesn't bring the deleted matchup back
+    assert MatchupStore(db_path, str(legacy_file)).load() == {}
+
+
+def test_malformed_legacy_file_raises_value_error(tmp_path):
+    legacy_file = tmp_path / 'matchups.json'
+    legacy_file.write_text(json.dumps({'15': [{'team1': TEAM_A}]}))
+    store = MatchupStore(str(tmp_path / 'matchups.db'), str(legacy_file))
+
+    with pytest.raises(ValueError):
+        store.add(15, TEAM_A, TEAM_B)
+    # Nothing was committed, so fixing the file lets the import go through
+    legacy_file.write_text(json.dumps({'15': [{'team1': TEAM_A, 'team2': TEAM_B}]}))
+    assert len(store.load()[15]) == 1
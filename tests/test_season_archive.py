@@ -0,0 +1,78 @@
+import sys
+
+import pytest
+import requests
+
+import season_archive
+import utils
+from season_archive import SeasonArchive, archive_tables, ingest
+
+PAYLOAD = {
+    'members': [{'id': 'o1', 'firstName': 'Ann', 'lastName': 'Lee'}, {'id': 'o2', 'displayName': 'bob'}],
+    'teams': [
+        {'id': 1, 'name': 'A', 'primaryOwner': 'o1', 'rankCalculatedFinal': 1,
+         'record': {'overall': {'wins': 10, 'losses': 4, 'ties': 0, 'pointsFor': 1500.5, 'pointsAgainst': 1400.0}}},
+        {'id': 2, 'name': 'B', 'primaryOwner': 'o2', 'rankCalculatedFinal': 2,
+         'record': {'overall': {'wins': 4, 'losses': 10, 'ties': 0, 'pointsFor': 1300.0, 'pointsAgainst': 1400.5}}}
+    ],
+    'schedule': [
+        {'matchupPeriodId': 1, 'playoffTierType': 'NONE',
+         'home': {'teamId': 1, 'totalPoints': 120.0}, 'away': {'teamId': 2, 'totalPoints': 90.0}},
+        {'matchupPeriodId': 15, 'playoffTierType': 'WINNERS_BRACKET',
+         'home': {'teamId': 1, 'totalPoints': 150.0}, 'away': {'teamId': 2, 'totalPoints': 100.0}}
+    ]
+}
+
+
+@pytest.fixture
+def empty_archive(tmp_path):
+    return SeasonArchive(str(tmp_path))
+
+
+def test_empty_archive_queries_return_empty_tables(empty_archive):
+    assert empty_archive.seasons() == []
+    assert empty_archive.all_time_records().empty
+    assert empty_archive.champions().empty
+    assert empty_archive.best_weeks(playoffs=True).empty
+
+
+def test_archive_of_missing_seasons_queries_as_empty(tmp_path, monkeypatch):
+    # Every season 404s, so only empty tables are written
+    def missing(league_id, views, season, extract=None):
+        response = requests.Response()
+        response.status_code = 404
+        raise requests.exceptions.HTTPError(response=response)
+    monkeypatch.setattr(utils, 'request_league_season', missing)
+
+    assert ingest([2020], {'Doinks': '1'}, directory=str(tmp_path)) == {(2020, 'Doinks'): 'missing'}
+    archive = SeasonArchive(str(tmp_path))
+    assert archive.all_time_records().empty
+    assert archive.best_weeks().empty
+
+
+@pytest.mark.parametrize('command', [['records'], ['champions'], ['best-weeks', '--playoffs', 'only']])
+def test_cli_on_an_empty_archive(tmp_path, monkeypatch, capsys, command):
+    monkeypatch.setattr(sys, 'argv', ['season_archive.py', '--dir', str(tmp_path), *command])
+    season_archive.main()
+    assert 'Empty DataFrame' in capsys.readouterr().out
+
+
+def test_queries(tmp_path):
+    teams, weeks = archive_tables(PAYLOAD, 2023, 'Doinks')
+    season_archive._write_table(weeks, season_archive._table_path(str(tmp_path), 2023, 'Doinks', 'weeks'))
+    season_archive._write_table(teams, season_archive._table_path(str(tmp_path), 2023, 'Doinks', 'teams'))
+    archive = SeasonArchive(str(tmp_path))
+
+    assert archive.seasons() == [2023]
+    records = archive.all_time_records()
+    assert list(records['owner']) == ['Ann Lee', 'bob']
+    assert list(records['titles']) == [1, 0]
+    assert list(archive.champions()['team']) == ['A']
+    assert list(archive.best_weeks(limit=1)['score']) == [150.0]
+    assert list(archive.best_weeks(limit=1, playoffs=False)['score']) == [120.0]
+
+
+def test_unranked_season_keeps_numeric_columns():
+    payload = {**PAYLOAD, 'teams': [{**team, 'rankCalculatedFinal': None} for team in PAYLOAD['teams']]}
+    teams, _ = archive_tables(payload, 2024, 'Doinks')
+    assert teams['final_rank'].dtype == 'float64'
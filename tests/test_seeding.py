@@ -0,0 +1,111 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+
+def reference_qualifiers(all_teams, playoff_slots=8, min_per_division=2):
+    """The row-by-row seeding loop seed_playoff_field replaced, as a set of (League, Name)"""
+    leagues = list(dict.fromkeys(all_teams['League']))
+    league_winners = {}
+    for league_name in leagues:
+        league_teams = all_teams[all_teams['League'] == league_name]
+        league_winners[league_name] = league_teams.iloc[0]['Name']
+
+    playoff_teams = []
+    league_counts = {league: 0 for league in leagues}
+    for _, team in all_teams.iterrows():
+        if team['Name'] in league_winners.values():
+            playoff_teams.append((team['League'], team['Name']))
+            league_counts[team['League']] += 1
+
+    for league_name in leagues:
+        if league_counts[league_name] < min_per_division:
+            league_teams = all_teams[all_teams['League'] == league_name]
+            for _, team in league_teams.iterrows():
+                if (team['League'], team['Name']) in playoff_teams:
+                    continue
+                playoff_teams.append((team['League'], team['Name']))
+                league_counts[league_name] += 1
+                if league_counts[league_name] >= min_per_division:
+                    break
+
+    for _, team in all_teams.iterrows():
+        if len(playoff_teams) >= playoff_slots:
+            break
+        if (team['League'], team['Name']) in playoff_teams:
+            continue
+        playoff_teams.append((team['League'], team['Name']))
+    return set(playoff_teams)
+
+
+def random_standings(rng):
+    """Sorted standings with few distinct records, so ties in Wins and Points For are common"""
+    rows = []
+    for division in range(rng.randint(1, 6)):
+        for team in range(rng.randint(1, 8)):
+            rows.append({
+                'League': f"D{division}",
+                'Name': f"D{division}T{team}",
+                'Wins': rng.randint(0, 4) + rng.choice([0, 0.5]),
+                'Points For': rng.choice([100.0, 110.0, 120.0])
+            })
+    standings = pd.DataFrame(rows)
+    return standings.sort_values(by=['Wins', 'Points For'], ascending=[False, False]).reset_index(drop=True)
+
+
+def qualifiers(all_teams, **rules):
+    qualified = utils.seed_playoff_field(all_teams, **rules)
+    return set(zip(all_teams.loc[qualified, 'League'], all_teams.loc[qualified, 'Name']))
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_seeding_matches_reference_loop(seed):
+    standings = random_standings(random.Random(seed))
+    assert qualifiers(standings) == reference_qualifiers(standings)
+
+
+def test_division_minimum_beats_better_records():
+    # D1's two teams have the worst records but still get in; D0's third-best team is left out
+    standings = pd.DataFrame({
+        'League': ['D0'] * 9 + ['D1', 'D1'],
+        'Name': [f"D0T{i}" for i in range(9)] + ['D1T0', 'D1T1'],
+        'Wins': [10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 0],
+        'Points For': [100.0] * 11
+    })
+    assert qualifiers(standings) == reference_qualifiers(standings)
+    assert {('D1', 'D1T0'), ('D1', 'D1T1')} <= qualifiers(standings)
+    assert len(qualifiers(standings)) == 8
+
+
+def test_guaranteed_spots_can_exceed_slots():
+    # Five divisions of two guaranteed teams each fill more than eight slots
+    standings = pd.DataFrame({
+        'League': [f"D{i % 5}" for i in range(15)],
+        'Name': [f"T{i}" for i in range(15)],
+        'Wins': list(range(15, 0, -1)),
+        'Points For': [100.0] * 15
+    })
+    assert len(qualifiers(standings)) == 10
+    assert qualifiers(standings) == reference_qualifiers(standings)
+
+
+def test_division_with_fewer_teams_than_the_minimum():
+    standings = pd.DataFrame({
+        'League': ['D0', 'D0', 'D0', 'D1'],
+        'Name': ['A', 'B', 'C', 'D'],
+        'Wins': [3, 2, 1, 0],
+        'Points For': [100.0] * 4
+    })
+    assert qualifiers(standings, playoff_slots=2) == reference_qualifiers(standings, playoff_slots=2)
+
+
+def test_batched_seeding_matches_row_by_row():
+    rng = np.random.default_rng(0)
+    division_rank = np.stack([rng.permutation(np.repeat(np.arange(4), 3)) for _ in range(50)])
+    batched = utils._qualify_seeds(division_rank, 8, 2, True)
+    for row, ranks in zip(batched, division_rank):
+        assert np.array_equal(row, utils._qualify_seeds(ranks, 8, 2, True))
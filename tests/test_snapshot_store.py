@@ -0,0 +1,51 @@
+import pytest
+
+import snapshot_store
+import utils
+from cache import TTLCache
+from week_store import FinalizedWeekStore
+from test_week_store import league_payload, scores
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_store, 'SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(utils, '_FINAL_WEEKS', FinalizedWeekStore(utils.parse_matchup, str(tmp_path / 'weeks')))
+    monkeypatch.setattr(utils, '_SEASON_LAST_WEEK', {})
+    monkeypatch.setattr(utils, '_MERGED_LEAGUES', {})
+    monkeypatch.setattr(utils, '_CACHE', TTLCache(utils.CACHE_TTLS))
+
+
+def test_latest_snapshot_per_season(state):
+    snapshot_store.save_snapshot(2024, 'L1', {'season': 2024})
+    snapshot_store.save_snapshot(2025, 'L1', {'season': 2025, 'n': 1})
+    snapshot_store.save_snapshot(2025, 'L1', {'season': 2025, 'n': 2})
+
+    assert snapshot_store.load_latest_snapshot(2024, 'L1')[0] == {'season': 2024}
+    assert snapshot_store.load_latest_snapshot(2025, 'L1')[0] == {'season': 2025, 'n': 2}
+    assert snapshot_store.load_latest_snapshot(2026, 'L1') is None
+
+
+def test_last_seasons_snapshot_is_not_restored_into_a_new_season(state, monkeypatch):
+    last_season = league_payload(current_week=18)
+    snapshot_store.save_snapshot(2025, 'L1', last_season)
+    monkeypatch.setattr(utils, 'SEASON', 2026)
+
+    assert utils._restore_snapshot('L1') is None
+    assert utils._FINAL_WEEKS.weeks(2026, 'L1') == set()
+    assert utils._open_weeks_filter('L1') is None
+
+    new_season = league_payload(current_week=1)
+    for entry in new_season['schedule']:
+        entry['home']['totalPoints'] = entry['away']['totalPoints'] = 0.0
+    _, league = utils._parse_with_final_weeks('L1', new_season)
+    assert scores(league.schedule) == scores(utils.parse_league(new_season).schedule)
+
+
+def test_snapshot_restores_its_own_season(state):
+    payload = league_payload(current_week=8)
+    snapshot_store.save_snapshot(utils.SEASON, 'L1', payload)
+
+    league = utils._restore_snapshot('L1')
+    assert scores(league.schedule) == scores(utils.parse_league(payload).schedule)
+    assert utils._FINAL_WEEKS.weeks(utils.SEASON, 'L1') == set(range(1, 8))
@@ -0,0 +1,95 @@
+import copy
+
+import pytest
+
+import utils
+from week_store import FinalizedWeekStore
+
+
+def league_payload(current_week, weeks=17, teams=4):
+    """A minimal ESPN league payload with a full round-robin-ish schedule"""
+    schedule = []
+    for week in range(1, weeks + 1):
+        for home in range(1, teams + 1, 2):
+            schedule.append({
+                'matchupPeriodId': week,
+                'playoffTierType': 'WINNERS_BRACKET' if week > 14 else 'NONE',
+                'home': {'teamId': home, 'totalPoints': 100.0 + week + home, 'totalPointsLive': 50.0 + home},
+                'away': {'teamId': home + 1, 'totalPoints': 90.0 + week, 'totalPointsLive': 40.0 + week}
+            })
+    return {
+        'id': 'L1',
+        'scoringPeriodId': current_week,
+        'teams': [{'id': team, 'name': f"Team {team}"} for team in range(1, teams + 1)],
+        'schedule': schedule
+    }
+
+
+def scores(matchups):
+    return [(m.week, m.home_id, m.home_score, m.away_id, m.away_score, m.playoff) for m in matchups]
+
+
+@pytest.fixture
+def final_weeks(tmp_path, monkeypatch):
+    store = FinalizedWeekStore(utils.parse_matchup, str(tmp_path))
+    monkeypatch.setattr(utils, '_FINAL_WEEKS', store)
+    monkeypatch.setattr(utils, '_SEASON_LAST_WEEK', {})
+    return store
+
+
+def test_merged_parse_matches_full_parse(final_weeks):
+    full = league_payload(current_week=10)
+    merged, league = utils._parse_with_final_weeks('L1', full)
+
+    assert scores(league.schedule) == scores(utils.parse_league(full).schedule)
+    assert merged['schedule'] == full['schedule']
+    assert final_weeks.weeks(utils.SEASON, 'L1') == set(range(1, 10))
+
+
+def test_rollover_with_filtered_schedule(final_weeks):
+    utils._parse_with_final_weeks('L1', league_payload(current_week=10))
+    assert '"value": [10, 11' in utils._open_weeks_filter('L1')['x-fantasy-filter']
+
+    # ESPN answers the filtered request with only the open weeks
+    full = league_payload(current_week=11)
+    hot = {**full, 'schedule': [entry for entry in full['schedule'] if entry['matchupPeriodId'] >= 10]}
+    merged, league = utils._parse_with_final_weeks('L1', hot)
+
+    assert scores(league.schedule) == scores(utils.parse_league(full).schedule)
+    assert merged['schedule'] == full['schedule']
+    assert final_weeks.weeks(utils.SEASON, 'L1') == set(range(1, 11))
+
+
+def test_finalized_week_is_never_rewritten(final_weeks):
+    utils._parse_with_final_weeks('L1', league_payload(current_week=3))
+    changed = league_payload(current_week=4)
+    changed['schedule'][0]['home']['totalPoints'] = 999.0
+    _, league = utils._parse_with_final_weeks('L1', changed)
+
+    assert league.schedule[0].home_score == utils.parse_league(league_payload(current_week=4)).schedule[0].home_score
+
+
+def test_seasons_are_kept_apart(final_weeks):
+    final_weeks.finalize(2024, 'L1', 1, league_payload(current_week=2)['schedule'][:2])
+
+    assert final_weeks.weeks(2024, 'L1') == {1}
+    assert final_weeks.weeks(2025, 'L1') == set()
+    assert final_weeks.schedule(2025, 'L1') == ([], [])
+
+
+def test_weeks_reload_from_disk(final_weeks):
+    full = league_payload(current_week=6)
+    utils._parse_with_final_weeks('L1', full)
+
+    reloaded = FinalizedWeekStore(utils.parse_matchup, final_weeks.directory)
+    entries, matchups = reloaded.schedule(utils.SEASON, 'L1')
+    assert entries == [entry for entry in full['schedule'] if entry['matchupPeriodId'] < 6]
+    assert scores(matchups) == scores(final_weeks.schedule(utils.SEASON, 'L1')[1])
+
+
+def test_damaged_week_file_is_skipped(final_weeks, tmp_path):
+    final_weeks.finalize(utils.SEASON, 'L1', 1, copy.deepcopy(league_payload(current_week=2)['schedule'][:2]))
+    (tmp_path / str(utils.SEASON) / 'L1' / '2.json').write_text('{not json')
+
+    reloaded = FinalizedWeekStore(utils.parse_matchup, str(tmp_path))
+    assert reloaded.weeks(utils.SEASON, 'L1') == {1}
@@ -1,6 +1,25 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import streamlit as st
+from assets import get_thumbnail, mirror_version, route_urls
+from cache import TTLCache
+from espn_http import ESPNSession
+from espn_fixtures import fixture_url
+from league_extract import extract_league
+from league_model import League, Matchup, Player, Team
+from matchup_store import MatchupStore
+from perf import bind, timed
+from refresh_scheduler import RefreshScheduler, RequestBudget
+from snapshot_store import save_snapshot, load_latest_snapshot
+from week_store import FinalizedWeekStore
 
 # League configurations
 LEAGUES = {
@@ -9,7 +28,17 @@ LEAGUES = {
     "Clunks": "112677575"
 }
 
-API_BASE_URL = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2025/segments/0/leagues/{leagueId}?view=mLiveScoring&view=mMatchupScore&view=mRoster&view=mSettings&view=mStandings&view=mStatus&view=mTeam&view=modular&view=mNav&view=mDraftDetail&platformVersion=ea036b729b6388bc4495a4b40c151e1a7dc80106"
+# Season shown on the dashboard; past seasons live in the season archive
+SEASON = 2025
+
+API_BASE_URL = "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/{season}/segments/0/leagues/{leagueId}?{views}&platformVersion=ea036b729b6388bc4495a4b40c151e1a7dc80106"
+
+# Fast-changing views, polled on every refresh. Records and streaks ride along
+# here (mTeam, mStandings) so standings never lag behind final scores.
+HOT_VIEWS = ['mLiveScoring', 'mMatchupScore', 'mStatus', 'mTeam', 'mStandings']
+
+# Slow-changing views, fetched rarely and merged into the hot payload
+COLD_VIEWS = ['mSettings', 'mRoster', 'mNav', 'mDraftDetail', 'modular']
 
 # NFL Team ID mapping
 NFL_TEAMS = {
@@ -23,6 +52,13 @@ NFL_TEAMS = {
     22: "ARI", 14: "LAR", 25: "SF", 26: "SEA"
 }
 
+# Lineup slot ID to (position, sort order) for the slots shown on rosters
+LINEUP_SLOTS = {
+    0: ('QB', 1),
+    17: ('K', 2),
+    18: ('P', 3)
+}
+
 # Team Name to Owner Name mapping
 TEAM_OWNERS = {
     "Ray Finkle": "Jason",
@@ -45,35 +81,215 @@ TEAM_OWNERS = {
     "Lets Get Reicharded": "Brian"
 }
 
-# Cache for NFL team logos
-_NFL_LOGOS_CACHE = None
+# Playoff seeding rules
+PLAYOFF_SLOTS = 8
+MIN_TEAMS_PER_DIVISION = 2
+DIVISION_WINNER_AUTO_BID = True
+HIGH_SCORE_BONUS = 0.5
 
+# Seasons simulated for playoff odds, batched so at most PLAYOFF_SIM_BATCH_SCORES
+# simulated scores are held at once
+PLAYOFF_SIM_TRIALS = 100_000
+PLAYOFF_SIM_BATCH_SCORES = 2_000_000
 
-def fetch_nfl_logos():
-    """Fetch NFL team logos from ESPN API and cache them"""
-    global _NFL_LOGOS_CACHE
+# Seconds before a cached payload goes stale, per endpoint
+CACHE_TTLS = {
+    'league_hot': 60,
+    'league_cold': 6 * 60 * 60,
+    'nfl_logos': 24 * 60 * 60
+}
 
-    if _NFL_LOGOS_CACHE is not None:
-        return _NFL_LOGOS_CACHE
+# Upper bound on concurrent ESPN requests when fetching every division
+MAX_FETCH_WORKERS = 8
 
-    try:
-        url = "https://site.web.api.espn.com/apis/site/v2/teams?region=us&lang=en&leagues=mlb%2Cnba%2Cnfl%2Cnhl%2Cwnba"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        # The data structure has 'nfl' as a direct key with divisions
-        nfl_data = data.get('nfl', [])
-
-        if not nfl_data:
-            return {}
-
-        # Build mapping of team abbreviation to logo URL
-        logo_map = {}
-        # nfl_data is a list of divisions
-        for division in nfl_data:
-            teams = division.get('teams', [])
-            for team in teams:
+# Seconds to wait on ESPN before giving up on a request
+REQUEST_TIMEOUT = 10
+
+# Retries per ESPN request on network errors, timeouts, 429s and 5xx responses
+FETCH_RETRIES = 2
+
+# Consecutive failures that open a host's circuit, and seconds until a trial request
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_AFTER = 30
+
+# Decode league payloads field by field from the response stream, keeping only
+# what the dashboard reads; False falls back to a full response.json()
+STREAM_LEAGUE_JSON = True
+
+# Upstream ESPN requests per minute shared by page loads and scheduled refreshes;
+# scheduled refreshes wait for room, page loads are never held back
+REQUEST_BUDGET_PER_MINUTE = 30
+
+_LOG = logging.getLogger(__name__)
+
+# Process-wide cache and pooled HTTP session shared by every session
+_CACHE = TTLCache(CACHE_TTLS)
+_BUDGET = RequestBudget(REQUEST_BUDGET_PER_MINUTE)
+_HTTP = ESPNSession(timeout=REQUEST_TIMEOUT, pool_maxsize=MAX_FETCH_WORKERS, budget=_BUDGET, retries=FETCH_RETRIES,
+                    failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_after=CIRCUIT_RESET_AFTER)
+_WARM_UP_LOCK = threading.Lock()
+
+# Snapshots are restored on the app's first rerun rather than on import, so
+# importing utils (tests, benchmark, archive CLI) never touches the disk
+_SNAPSHOTS_RESTORED = False
+_RESTORE_LOCK = threading.Lock()
+
+# Last parsed league per league_id as (cold, hot, League); the League is
+# reused while both tiers are unchanged so per-league indexes stay valid
+_MERGED_LEAGUES = {}
+_MERGE_LOCK = threading.Lock()
+
+# Bumped whenever a league is re-parsed from new data
+_DATA_VERSION = 0
+
+# Highest matchup period seen in each league's schedule
+_SEASON_LAST_WEEK = {}
+
+# Roster index per league as (League, asset mirror version, index)
+_ROSTER_INDEXES = {}
+
+# All-league matchups table, patched in place while only live-week scores change
+_MATCHUP_TABLE = {'leagues': None, 'df': None, 'rows': {}, 'version': 0, 'rebuilt': True, 'assets': None}
+_MATCHUP_LOCK = threading.Lock()
+
+# Each week's high score row in the matchups table as (version, rows, {week: row})
+_WEEKLY_HIGHS = (None, 0, {})
+
+# Base URL of a local espn_fixtures.py server that stands in for ESPN, if set
+ESPN_FIXTURE_URL = os.environ.get('ESPN_FIXTURE_URL')
+
+NFL_SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+NFL_LOGOS_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/teams"
+
+
+def parse_matchup(entry, current_week=None):
+    """Parse one schedule entry into a Matchup, using live points if it is in the current week"""
+    week = entry.get('matchupPeriodId')
+    # The current week is still being played, so use live points
+    points_key = 'totalPointsLive' if week == current_week else 'totalPoints'
+    home = entry.get('home', {})
+    away = entry.get('away')
+    return Matchup(
+        week=week,
+        home_id=home.get('teamId'),
+        home_score=round(home.get(points_key, 0), 1),
+        away_id=away.get('teamId') if away else None,
+        away_score=round(away.get(points_key, 0), 1) if away else None,
+        playoff=entry.get('playoffTierType', 'NONE') != 'NONE'
+    )
+
+
+def parse_league(data, final_weeks=(), final_matchups=()):
+    """Parse an ESPN league payload into the compact League model the dashboard reads
+
+    Schedule entries in final_weeks are skipped and final_matchups, already
+    parsed for those weeks, are used in their place.
+    """
+    current_week = data.get('scoringPeriodId', 1)
+
+    teams = {}
+    for team in data.get('teams', []):
+        record = team.get('record', {}).get('overall', {})
+        streak_type = record.get('streakType', '')
+        streak_length = record.get('streakLength', 0)
+
+        # Format streak
+        if streak_type and streak_length > 0:
+            streak = f"{streak_type[0].upper()}{streak_length}"
+        else:
+            streak = "-"
+
+        name = team.get('name', 'Unknown')
+        teams[team.get('id')] = Team(
+            id=team.get('id'),
+            name=name,
+            logo=team.get('logo', ''),
+            owner=TEAM_OWNERS.get(name, ''),
+            wins=record.get('wins', 0),
+            losses=record.get('losses', 0),
+            points_for=record.get('pointsFor', 0),
+            points_against=record.get('pointsAgainst', 0),
+            streak=streak,
+            transactions=team.get('transactionCounter', {}).get('acquisitions', 0)
+        )
+
+    schedule = list(final_matchups)
+    for entry in data.get('schedule', []):
+        if entry.get('matchupPeriodId') not in final_weeks:
+            schedule.append(parse_matchup(entry, current_week))
+
+    roster_teams = data.get('draftDetail', {}).get('teams', [])
+    if not roster_teams:
+        roster_teams = data.get('teams', [])
+
+    rosters = {}
+    for team in roster_teams:
+        if team.get('id') in rosters:
+            continue
+        players = []
+        for entry in team.get('roster', {}).get('entries', []):
+            lineup_slot_id = entry.get('lineupSlotId', 0)
+            if lineup_slot_id not in LINEUP_SLOTS:
+                # Only the slots the dashboard shows; bench and IR are left out
+                continue
+            position, sort_order = LINEUP_SLOTS[lineup_slot_id]
+            player_pool_entry = entry.get('playerPoolEntry', {})
+            player_info = player_pool_entry.get('player', {})
+            positional_rank = player_pool_entry.get("ratings", {}).get("0", {}).get("positionalRanking")
+            players.append(Player(
+                name=player_info.get('fullName', 'Unknown'),
+                position=position,
+                nfl_team=NFL_TEAMS.get(player_info.get('proTeamId'), 'N/A'),
+                rank=positional_rank if positional_rank else '-',
+                sort=sort_order
+            ))
+        players.sort(key=lambda x: x.sort)
+        rosters[team.get('id')] = players
+
+    return League(id=data.get('id'), current_week=current_week, teams=teams, schedule=schedule, rosters=rosters)
+
+
+# Matchup periods that are over, saved once and never refetched or re-parsed
+_FINAL_WEEKS = FinalizedWeekStore(parse_matchup)
+
+
+def _upstream_url(url):
+    """Route an ESPN URL to the local fixture server when ESPN_FIXTURE_URL is set"""
+    if ESPN_FIXTURE_URL:
+        return fixture_url(ESPN_FIXTURE_URL, url)
+    return url
+
+
+# Logos are fetched from the fixture server too when it stands in for ESPN
+if ESPN_FIXTURE_URL:
+    route_urls(_upstream_url)
+
+
+def get_cache_stats():
+    """Get hit, miss and refresh counters for the ESPN payload cache"""
+    return _CACHE.stats()
+
+
+def get_http_stats():
+    """Get per-host connection reuse, 304 and bytes-saved stats for ESPN requests"""
+    return _HTTP.stats()
+
+
+def get_coalescing_stats():
+    """Get how many waiters joined each ESPN request shared across sessions"""
+    return _HTTP.flight_stats()
+
+
+def _request_nfl_logos():
+    """Download NFL team logos from ESPN, raising on request errors"""
+    data = _HTTP.get_json(_upstream_url(NFL_LOGOS_URL))
+
+    # Build mapping of team abbreviation to logo URL
+    logo_map = {}
+    for sport in data.get('sports', []):
+        for league in sport.get('leagues', []):
+            for entry in league.get('teams', []):
+                team = entry.get('team', {})
                 abbr = team.get('abbreviation')
                 # Get the first logo from the logos array
                 logos = team.get('logos', [])
@@ -81,209 +297,572 @@ def fetch_nfl_logos():
                 if abbr and logo_url:
                     logo_map[abbr] = logo_url
 
-        _NFL_LOGOS_CACHE = logo_map
-        return logo_map
+    return logo_map
+
 
+def fetch_nfl_logos():
+    """Fetch NFL team logos from ESPN API and cache them"""
+    try:
+        return _CACHE.get('nfl_logos', None, _request_nfl_logos)
     except requests.exceptions.RequestException as e:
         st.warning(f"Could not fetch NFL logos: {e}")
         return {}
 
 
 def get_nfl_logo(team_abbr):
-    """Get the logo URL for an NFL team abbreviation"""
+    """Get the mirrored thumbnail logo for an NFL team abbreviation"""
     logos = fetch_nfl_logos()
-    return logos.get(team_abbr, '')
+    return get_thumbnail(logos.get(team_abbr, ''))
+
+
+def build_league_url(league_id, views, season=SEASON):
+    """Build the ESPN league URL for a season requesting only the given views"""
+    return API_BASE_URL.format(season=season, leagueId=league_id,
+                               views='&'.join(f"view={view}" for view in views))
+
+
+def _request_league_data(league_id, views, headers=None):
+    """Download a league payload with the given views from ESPN, raising on request errors"""
+    extract = extract_league if STREAM_LEAGUE_JSON else None
+    return _HTTP.get_json(_upstream_url(build_league_url(league_id, views)), headers=headers, extract=extract)
+
+
+def request_league_season(league_id, views, season, extract=None):
+    """Download a league's views for any season through the shared session, raising on request errors
+
+    Waits for room in the request budget first, so bulk jobs like the season
+    archive never crowd out the dashboard's own requests.
+    """
+    time.sleep(_BUDGET.wait_time(1))
+    return _HTTP.get_json(_upstream_url(build_league_url(league_id, views, season)), extract=extract)
+
+
+def _open_weeks_filter(league_id):
+    """Build an x-fantasy-filter header asking ESPN only for the matchup periods that aren't finalized"""
+    last_week = _SEASON_LAST_WEEK.get(league_id)
+    final_weeks = _FINAL_WEEKS.weeks(SEASON, league_id)
+    if last_week is None or not final_weeks:
+        # Nothing is final yet; the first full schedule fills the store
+        return None
+    open_weeks = [week for week in range(1, last_week + 1) if week not in final_weeks] or [last_week]
+    return {'x-fantasy-filter': json.dumps({'schedule': {'filterMatchupPeriodIds': {'value': open_weeks}}})}
+
+
+def _request_hot_views(league_id):
+    """Download a league's hot views, with only the schedule weeks that can still change"""
+    return _request_league_data(league_id, HOT_VIEWS, _open_weeks_filter(league_id))
+
+
+def _finalize_weeks(league_id, league_data):
+    """Save the weeks before the current scoring period once and splice every finalized week into the schedule"""
+    current_week = league_data.get('scoringPeriodId', 1)
+    final_weeks = _FINAL_WEEKS.weeks(SEASON, league_id)
+
+    open_entries = []
+    newly_final = {}
+    for entry in league_data.get('schedule', []):
+        week = entry.get('matchupPeriodId')
+        if week in final_weeks:
+            continue
+        if week is not None and week < current_week:
+            newly_final.setdefault(week, []).append(entry)
+        else:
+            open_entries.append(entry)
+        if week is not None and week > _SEASON_LAST_WEEK.get(league_id, 0):
+            _SEASON_LAST_WEEK[league_id] = week
+
+    for week, entries in newly_final.items():
+        _FINAL_WEEKS.finalize(SEASON, league_id, week, entries)
+
+    final_entries, _ = _FINAL_WEEKS.schedule(SEASON, league_id)
+    return {**league_data, 'schedule': final_entries + open_entries}
+
+
+def _parse_with_final_weeks(league_id, league_data):
+    """Parse a merged league payload, reusing the Matchups of its finalized weeks"""
+    league_data = _finalize_weeks(league_id, league_data)
+    _, final_matchups = _FINAL_WEEKS.schedule(SEASON, league_id)
+    return league_data, parse_league(league_data, _FINAL_WEEKS.weeks(SEASON, league_id), final_matchups)
+
+
+def merge_league_views(cold_data, hot_data):
+    """Merge hot and cold view payloads into one league object, hot fields winning"""
+    merged = dict(cold_data)
+    for key, value in hot_data.items():
+        if key == 'teams' and 'teams' in cold_data:
+            # Both tiers describe teams; combine them per team id
+            cold_teams = {team.get('id'): team for team in cold_data['teams']}
+            merged['teams'] = [{**cold_teams.get(team.get('id'), {}), **team} for team in value]
+        else:
+            merged[key] = value
+    return merged
+
+
+def _load_league_data(league_id):
+    """Get a parsed league through the cache, raising on request errors"""
+    global _DATA_VERSION
+    cold_data = _CACHE.get('league_cold', league_id, lambda: _request_league_data(league_id, COLD_VIEWS))
+    hot_data = _CACHE.get('league_hot', league_id, lambda: _request_hot_views(league_id))
+
+    with _MERGE_LOCK:
+        merged = _MERGED_LEAGUES.get(league_id)
+        if merged is not None and merged[0] is cold_data and merged[1] is hot_data:
+            return merged[2]
+        league_data, league = _parse_with_final_weeks(league_id, merge_league_views(cold_data, hot_data))
+        _MERGED_LEAGUES[league_id] = (cold_data, hot_data, league)
+        _DATA_VERSION += 1
+
+    # Only newly merged payloads reach the snapshot store
+    try:
+        save_snapshot(SEASON, league_id, league_data)
+    except OSError:
+        # The snapshot store is a fallback; never fail a fetch over it
+        pass
+    return league
+
+
+def _restore_snapshot(league_id):
+    """Load a league's latest on-disk snapshot into the cache and return its League, or None if there isn't one"""
+    stored = load_latest_snapshot(SEASON, league_id)
+    if stored is None:
+        return None
+    snapshot, saved_at = stored
+    # The merged snapshot stands in for both tiers; the cold tier is
+    # marked stale so it is revalidated on first use
+    _CACHE.set('league_hot', league_id, snapshot, age=max(time.time() - saved_at, 0))
+    _CACHE.set('league_cold', league_id, snapshot, age=CACHE_TTLS['league_cold'])
+    _, league = _parse_with_final_weeks(league_id, snapshot)
+    with _MERGE_LOCK:
+        # Keyed by the cached payload itself so the next load reuses this League
+        _MERGED_LEAGUES[league_id] = (snapshot, snapshot, league)
+    return league
+
+
+def restore_snapshots():
+    """Load each league's latest snapshot into the cache once per process so a cold start serves it right away"""
+    global _SNAPSHOTS_RESTORED
+    with _RESTORE_LOCK:
+        if _SNAPSHOTS_RESTORED:
+            return
+        for league_id in LEAGUES.values():
+            _restore_snapshot(league_id)
+        _SNAPSHOTS_RESTORED = True
+
+
+def get_data_age():
+    """Get the age in seconds of the oldest league data being served, or None if nothing is cached"""
+    ages = [_CACHE.age('league_hot', league_id) for league_id in LEAGUES.values()]
+    ages = [age for age in ages if age is not None]
+    return max(ages) if ages else None
+
+
+def format_age(seconds):
+    """Format a number of seconds as a short age like 45s, 12m, 3h or 2d"""
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
+
+
+def _fallback_league_data(league_id, error):
+    """Serve a league's last good snapshot after a failed fetch, reporting the error only if there is none"""
+    league = _restore_snapshot(league_id)
+    if league is None:
+        st.error(f"Error fetching data for league {league_id}: {error}")
+    return league
 
 
 def fetch_league_data(league_id):
     """Fetch data from ESPN Fantasy Football API for a specific league"""
     try:
-        url = API_BASE_URL.format(leagueId=league_id)
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return _load_league_data(league_id)
     except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching data for league {league_id}: {e}")
-        return None
+        return _fallback_league_data(league_id, e)
+
+
+def _warm_up():
+    try:
+        for league_id in LEAGUES.values():
+            _load_league_data(league_id)
+        _CACHE.get('nfl_logos', None, _request_nfl_logos)
+    except requests.exceptions.RequestException:
+        # Warm-up is best effort; the next foreground fetch reports errors
+        pass
+    finally:
+        _WARM_UP_LOCK.release()
+    update_playoff_odds()
+
+
+def warm_up_caches():
+    """Prefetch every league and the NFL logos on a background thread if no warm-up is running"""
+    if _WARM_UP_LOCK.acquire(blocking=False):
+        threading.Thread(target=_warm_up, daemon=True).start()
+
+
+def _request_nfl_scoreboard():
+    """Download the current NFL scoreboard from ESPN, raising on request errors"""
+    return _HTTP.get_json(_upstream_url(NFL_SCOREBOARD_URL))
+
+
+def _refresh_leagues():
+    """Refetch every league's hot views now and re-merge the ones that changed"""
+    for league_id in LEAGUES.values():
+        try:
+            _CACHE.refresh('league_hot', league_id, lambda: _request_hot_views(league_id))
+            _load_league_data(league_id)
+        except Exception:
+            # One failing league shouldn't hold back the others this tick
+            _LOG.exception("Scheduled refresh failed for league %s", league_id)
+    update_playoff_odds()
+
+
+# Refreshes the hot tier on a schedule set by NFL game windows; each cycle
+# costs one request per league plus the scoreboard that picks the interval
+_SCHEDULER = RefreshScheduler(_refresh_leagues, _request_nfl_scoreboard, _BUDGET,
+                              requests_per_refresh=len(LEAGUES) + 1)
+
+
+def start_refresh_scheduler():
+    """Start the background refresh scheduler if it isn't running yet"""
+    _SCHEDULER.start()
+
+
+def get_refresh_stats():
+    """Get the refresh scheduler's game window, next refresh time and counters"""
+    return _SCHEDULER.stats()
+
+
+def get_data_version():
+    """Get a counter that changes whenever any league's data or the simulated playoff odds change"""
+    return _DATA_VERSION + _PLAYOFF_ODDS['updates']
+
+
+def fetch_leagues_parallel(league_ids):
+    """Fetch several leagues concurrently so the batch costs one round trip"""
+    league_ids = list(league_ids)
+    if not league_ids:
+        return {}
+
+    # Workers never touch Streamlit; errors are reported from the calling thread
+    with ThreadPoolExecutor(max_workers=min(len(league_ids), MAX_FETCH_WORKERS)) as executor:
+        futures = {league_id: executor.submit(bind(_load_league_data), league_id) for league_id in league_ids}
+
+    results = {}
+    for league_id, future in futures.items():
+        try:
+            results[league_id] = future.result()
+        except requests.exceptions.RequestException as e:
+            results[league_id] = _fallback_league_data(league_id, e)
+    return results
+
+
+# Session state keys holding the current rerun's league payloads and the indexes built from them
+_SNAPSHOT_KEY = '_league_snapshot'
+_SCORE_INDEX_KEY = '_score_index'
+
+
+def begin_rerun():
+    """Drop the previous rerun's league snapshot so this rerun fetches fresh data"""
+    st.session_state.pop(_SNAPSHOT_KEY, None)
+    st.session_state.pop(_SCORE_INDEX_KEY, None)
+
+
+def get_league_snapshot():
+    """Fetch each league in LEAGUES at most once per rerun and share the payloads"""
+    snapshot = st.session_state.get(_SNAPSHOT_KEY)
+    if snapshot is None:
+        with st.spinner("Loading league data..."):
+            snapshot = fetch_leagues_parallel(LEAGUES.values())
+        st.session_state[_SNAPSHOT_KEY] = snapshot
+    return snapshot
+
+
+def get_league_data(league_id):
+    """Get a league's parsed League from the current rerun's snapshot"""
+    snapshot = get_league_snapshot()
+    if league_id not in snapshot:
+        snapshot[league_id] = fetch_league_data(league_id)
+    return snapshot[league_id]
+
+
+def get_team(league_id, team_id):
+    """Get a Team from the current rerun's snapshot, or None if it isn't there"""
+    league = get_league_data(league_id)
+    return league.teams.get(team_id) if league else None
+
+
+def build_score_index(snapshot):
+    """Index every (league_id, team_id, week) in a snapshot to its live or final score"""
+    index = {}
+    for league_id, league in snapshot.items():
+        if not league:
+            continue
+        for matchup in league.schedule:
+            # Keep the first matchup a team appears in for a week
+            index.setdefault((league_id, matchup.home_id, matchup.week), matchup.home_score)
+            if matchup.away_id is not None:
+                index.setdefault((league_id, matchup.away_id, matchup.week), matchup.away_score)
+    return index
+
+
+def get_score_index():
+    """Get the score index for the current rerun's snapshot, building it on first use"""
+    index = st.session_state.get(_SCORE_INDEX_KEY)
+    if index is None:
+        index = build_score_index(get_league_snapshot())
+        st.session_state[_SCORE_INDEX_KEY] = index
+    return index
+
+
+def get_team_score_for_week(league_id, team_id, week):
+    """Get a specific team's score for a specific week"""
+    return get_score_index().get((league_id, team_id, week))
 
 
 def get_current_week():
     """Get current scoring period from any league"""
     for league_id in LEAGUES.values():
-        league_data = fetch_league_data(league_id)
-        if league_data and 'scoringPeriodId' in league_data:
-            return league_data['scoringPeriodId']
+        league = get_league_data(league_id)
+        if league:
+            return league.current_week
     return 1
 
 
-def get_team_roster(data, team_id):
-    """Extract roster for a specific team with NFL team and positional ranking"""
-    if not data:
-        return []
+# Playoff matchups shared by every session; imported from playoff_matchups.json on first use
+_PLAYOFF_MATCHUPS = MatchupStore()
 
-    draft_detail = data.get('draftDetail', {})
-    teams_data = draft_detail.get('teams', [])
-
-    if not teams_data:
-        teams_data = data.get('teams', [])
-
-    for team in teams_data:
-        if team.get('id') == team_id:
-            roster_entries = team.get('roster', {}).get('entries', [])
-            players = []
-
-            for entry in roster_entries:
-                player_pool_entry = entry.get('playerPoolEntry', {})
-                player_info = player_pool_entry.get('player', {})
-                player_name = player_info.get('fullName', 'Unknown')
-                lineup_slot_id = entry.get('lineupSlotId', 0)
-                pro_team_id = player_info.get('proTeamId')
-                nfl_team = NFL_TEAMS.get(pro_team_id, 'N/A') if pro_team_id else 'N/A'
-                nfl_logo = get_nfl_logo(nfl_team) if nfl_team != 'N/A' else ''
-                ratings = player_pool_entry.get("ratings", {})
-                positional_rank = ratings.get("0", {}).get("positionalRanking")
-
-                if lineup_slot_id == 0:
-                    position = 'QB'
-                    sort_order = 1
-                elif lineup_slot_id == 17:
-                    position = 'K'
-                    sort_order = 2
-                elif lineup_slot_id == 18:
-                    position = 'P'
-                    sort_order = 3
-                else:
-                    position = f'SLOT-{lineup_slot_id}'
-                    sort_order = 99
-
-                players.append({
-                    'Player': player_name,
-                    'Position': position,
-                    'NFL Team': nfl_team,
-                    'NFL Logo': nfl_logo,
-                    'Rank': positional_rank if positional_rank else '-',
-                    'Sort': sort_order
-                })
 
-            players.sort(key=lambda x: x['Sort'])
-            return players
+def load_playoff_matchups():
+    """Get playoff matchups as {week: [matchup, ...]}, re-read from the store only after a write"""
+    try:
+        return _PLAYOFF_MATCHUPS.load()
+    except (sqlite3.Error, OSError, ValueError) as e:
+        st.error(f"Failed to load matchups: {e}")
+        return {}
+
+
+def add_playoff_matchup(week, team1, team2):
+    """Save a playoff matchup; returns True if added, False if it already exists and None on error"""
+    try:
+        return _PLAYOFF_MATCHUPS.add(week, team1, team2) is not None
+    except (sqlite3.Error, OSError, ValueError) as e:
+        st.error(f"Failed to save matchups: {e}")
+        return None
+
+
+def delete_playoff_matchup(matchup_id):
+    """Delete a playoff matchup by id"""
+    try:
+        _PLAYOFF_MATCHUPS.delete(matchup_id)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        st.error(f"Failed to save matchups: {e}")
+
+
+def build_roster_index(league):
+    """Build every team's roster display rows for a League in one pass, keyed by team_id"""
+    # One logo fetch per build, so a failing fetch is retried and reported once
+    logo_urls = fetch_nfl_logos()
+    nfl_logos = {abbr: get_thumbnail(logo_urls.get(abbr, '')) for abbr in NFL_TEAMS.values()}
+    return {
+        team_id: [{
+            'Player': player.name,
+            'Position': player.position,
+            'NFL Team': player.nfl_team,
+            'NFL Logo': nfl_logos.get(player.nfl_team, ''),
+            'Rank': player.rank,
+            'Sort': player.sort
+        } for player in players]
+        for team_id, players in league.rosters.items()
+    }
+
+
+def get_roster_index(league):
+    """Get the roster index for a League, reusing it while the league and logo thumbnails are unchanged"""
+    version = mirror_version()
+    cached = _ROSTER_INDEXES.get(league.id)
+    if cached is not None and cached[0] is league and cached[1] == version:
+        return cached[2]
+
+    index = build_roster_index(league)
+    _ROSTER_INDEXES[league.id] = (league, version, index)
+    return index
 
-    return []
+
+def get_team_roster(league, team_id):
+    """Get roster rows for a specific team with NFL team and positional ranking"""
+    if not league:
+        return []
+    return get_roster_index(league).get(team_id, [])
 
 
 def get_all_teams():
     """Get all teams from all leagues"""
     all_teams = []
     for league_name, league_id in LEAGUES.items():
-        league_data = fetch_league_data(league_id)
-        if league_data and 'teams' in league_data:
-            for team in league_data['teams']:
+        league = get_league_data(league_id)
+        if league:
+            for team in league.teams.values():
                 all_teams.append({
                     'league_name': league_name,
                     'league_id': league_id,
-                    'team_id': team.get('id'),
-                    'team_name': team.get('name', 'Unknown'),
-                    'wins': team.get('record', {}).get('overall', {}).get('wins', 0),
-                    'losses': team.get('record', {}).get('overall', {}).get('losses', 0)
+                    'team_id': team.id,
+                    'team_name': team.name,
+                    'wins': team.wins,
+                    'losses': team.losses
                 })
     return sorted(all_teams, key=lambda x: (x['league_name'], -x['wins']))
 
 
-def process_league_standings(data, league_name):
-    """Process league data into standings records"""
-    if not data or 'teams' not in data:
+@timed()
+def process_league_standings(league, league_name):
+    """Process a League into standings records"""
+    if not league:
         return []
-    teams_data = []
-    for team in data['teams']:
-        # Get streak information
-        record = team.get('record', {}).get('overall', {})
-        streak_type = record.get('streakType', '')
-        streak_length = record.get('streakLength', 0)
+    return [{
+        'League': league_name,
+        'Name': team.name,
+        'Team Display': team.display_name,
+        'Wins': team.wins,
+        'Losses': team.losses,
+        'Points For': team.points_for,
+        'Points Against': team.points_against,
+        'Transactions': team.transactions,
+        'Streak': team.streak
+    } for team in league.teams.values()]
 
-        # Format streak
-        if streak_type and streak_length > 0:
-            streak = f"{streak_type[0].upper()}{streak_length}"
-        else:
-            streak = "-"
 
-        team_info = {
-            'League': league_name,
-            'Name': team.get('name', 'Unknown'),
-            'Wins': team.get('record', {}).get('overall', {}).get('wins', 0),
-            'Losses': team.get('record', {}).get('overall', {}).get('losses', 0),
-            'Points For': team.get('record', {}).get('overall', {}).get('pointsFor', 0),
-            'Points Against': team.get('record', {}).get('overall', {}).get('pointsAgainst', 0),
-            'Transactions': team.get('transactionCounter', {}).get('acquisitions', 0),
-            'Streak': streak
-        }
-        teams_data.append(team_info)
-    return teams_data
-
-
-def process_matchups(data, league_name):
-    """Process matchup data for current week"""
-    if not data or 'schedule' not in data:
+@timed()
+def process_matchups(league, league_name):
+    """Process a League's schedule into matchup records, skipping byes"""
+    if not league:
         return []
-    schedule = data.get('schedule', [])
-    teams = data.get('teams', [])
-    current_week = data.get('scoringPeriodId', 1)
-    team_map = {team.get('id'): team.get('name', 'Unknown') for team in teams}
-    logo_map = {team.get('id'): team.get('logo', '') for team in teams}
+    teams = league.teams
+    unknown = Team(None, 'Unknown', '', '', 0, 0, 0, 0, '-', 0)
 
     matchups = []
-    for matchup in schedule:
-        matchup_week = matchup.get('matchupPeriodId')
-        home = matchup.get('home', {})
-        away = matchup.get('away', {})
-        if not away:
+    for matchup in league.schedule:
+        if matchup.away_id is None:
             continue
+        home = teams.get(matchup.home_id, unknown)
+        away = teams.get(matchup.away_id, unknown)
+        matchups.append({
+            'League': league_name,
+            'Week': matchup.week,
+            'Home Team': home.name,
+            'Home Display': home.display_name,
+            'Home Owner': home.owner,
+            'Home Logo': get_thumbnail(home.logo),
+            'Home Score': matchup.home_score,
+            'Away Team': away.name,
+            'Away Display': away.display_name,
+            'Away Owner': away.owner,
+            'Away Logo': get_thumbnail(away.logo),
+            'Away Score': matchup.away_score
+        })
+    return matchups
 
-        home_team_id = home.get('teamId')
-        away_team_id = away.get('teamId')
 
-        if matchup_week == current_week:
-            home_score = round(home.get('totalPointsLive', 0), 1)
-            away_score = round(away.get('totalPointsLive', 0), 1)
-        else:
-            home_score = round(home.get('totalPoints', 0), 1)
-            away_score = round(away.get('totalPoints', 0), 1)
+def _live_week_scores(old, new):
+    """Get a league's live-week (home, away) scores if they are all that changed since old, else None"""
+    if old.current_week != new.current_week or len(old.schedule) != len(new.schedule):
+        return None
+    if old.teams.keys() != new.teams.keys() or any(
+            (team.name, team.owner, team.logo) != (new.teams[team_id].name, new.teams[team_id].owner,
+                                                   new.teams[team_id].logo)
+            for team_id, team in old.teams.items()):
+        return None
 
-        matchup_info = {
-            'League': league_name,
-            'Week': matchup_week,
-            'Home Team': team_map.get(home_team_id, 'Unknown'),
-            'Home Logo': logo_map.get(home_team_id, ''),
-            'Home Score': home_score,
-            'Away Team': team_map.get(away_team_id, 'Unknown'),
-            'Away Logo': logo_map.get(away_team_id, ''),
-            'Away Score': away_score
-        }
-        matchups.append(matchup_info)
-    return matchups
+    week = new.current_week
+    for before, after in zip(old.schedule, new.schedule):
+        if before is after:
+            # A finalized week's Matchup, shared between parses
+            continue
+        if (before.week, before.home_id, before.away_id) != (after.week, after.home_id, after.away_id):
+            return None
+        if after.week != week and (before.home_score, before.away_score) != (after.home_score, after.away_score):
+            return None
+    return [(matchup.home_score, matchup.away_score) for matchup in new.schedule
+            if matchup.week == week and matchup.away_id is not None]
+
+
+def _patch_live_week(df, rows, scores):
+    """Write live-week (home, away) scores into the given matchups table rows, flagging rows whose score moved"""
+    home_scores, away_scores = (np.array(side, dtype=float) for side in zip(*scores)) if scores else ([], [])
+    home = df['Home Score'].to_numpy(copy=True)
+    away = df['Away Score'].to_numpy(copy=True)
+    changed = np.zeros(len(df), dtype=bool)
+    changed[rows] = (home[rows] != home_scores) | (away[rows] != away_scores)
+    home[rows] = home_scores
+    away[rows] = away_scores
+    df['Home Score'] = home
+    df['Away Score'] = away
+    df['Changed'] = changed
 
 
 def fetch_all_matchups():
-    """Fetch and aggregate matchups from all leagues"""
-    all_matchups = []
-    for league_name, league_id in LEAGUES.items():
-        league_data = fetch_league_data(league_id)
-        if league_data:
-            matchups = process_matchups(league_data, league_name)
-            all_matchups.extend(matchups)
-    if not all_matchups:
+    """Get matchups from all leagues as one table, patching only live-week scores when that is all that changed
+
+    The 'Changed' column flags rows whose score moved in the latest update;
+    every row is flagged after a full rebuild.
+    """
+    leagues = [(league_name, get_league_data(league_id)) for league_name, league_id in LEAGUES.items()]
+    leagues = [(league_name, league) for league_name, league in leagues if league]
+    if not leagues:
         return None
-    return pd.DataFrame(all_matchups)
+
+    with _MATCHUP_LOCK:
+        table = _MATCHUP_TABLE
+        # Logo columns hold mirrored thumbnails, so newly mirrored logos need a rebuild too
+        assets_version = mirror_version()
+        previous = table['leagues'] if table['assets'] == assets_version else None
+        if previous is not None and len(previous) == len(leagues) and all(
+                before is after for (_, before), (_, after) in zip(previous, leagues)):
+            return table['df'].copy()
+
+        df = None
+        if previous is not None and [name for name, _ in previous] == [name for name, _ in leagues]:
+            rows, scores = [], []
+            for (league_name, before), (_, after) in zip(previous, leagues):
+                if before is after:
+                    continue
+                league_scores = _live_week_scores(before, after)
+                league_rows = table['rows'].get((league_name, after.current_week), [])
+                if league_scores is None or len(league_rows) != len(league_scores):
+                    break
+                rows.extend(league_rows)
+                scores.extend(league_scores)
+            else:
+                df = table['df']
+                _patch_live_week(df, np.array(rows, dtype=int), scores)
+
+        rebuilt = df is None
+        if rebuilt:
+            all_matchups = []
+            for league_name, league in leagues:
+                all_matchups.extend(process_matchups(league, league_name))
+            if not all_matchups:
+                return None
+            df = pd.DataFrame(all_matchups)
+            # Live-week patches write float scores
+            df['Home Score'] = df['Home Score'].astype(float)
+            df['Away Score'] = df['Away Score'].astype(float)
+            df['Changed'] = True
+            table['rows'] = df.groupby(['League', 'Week'], sort=False).indices
+
+        table['version'] += 1
+        df.attrs['matchups_version'] = table['version']
+        table.update(leagues=leagues, df=df, rebuilt=rebuilt, assets=assets_version)
+        return df.copy()
 
 
 def fetch_all_leagues():
     """Fetch and aggregate data from all leagues"""
     all_teams = []
     for league_name, league_id in LEAGUES.items():
-        with st.spinner(f"Loading {league_name} league data..."):
-            league_data = fetch_league_data(league_id)
-            if league_data:
-                teams = process_league_standings(league_data, league_name)
-                all_teams.extend(teams)
+        league = get_league_data(league_id)
+        if league:
+            teams = process_league_standings(league, league_name)
+            all_teams.extend(teams)
     if not all_teams:
         return None
     df = pd.DataFrame(all_teams)
@@ -294,89 +873,295 @@ def fetch_all_leagues():
     return df
 
 
-def calculate_playoff_standings(df, matchups_df=None):
-    """Calculate playoff standings with league winner guarantee and min 2 per league rule"""
+def build_team_week_scores(matchups_df):
+    """Melt matchups into one row per team per week, home and away interleaved in schedule order"""
+    columns = ['Week', 'League', 'Team Name', 'Team Display', 'Score', 'Opponent', 'Opponent Display']
+    if matchups_df is None or matchups_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    home_teams = matchups_df['Home Team'].to_numpy()
+    away_teams = matchups_df['Away Team'].to_numpy()
+    home_displays = matchups_df['Home Display'].to_numpy()
+    away_displays = matchups_df['Away Display'].to_numpy()
+    return pd.DataFrame({
+        'Week': np.repeat(matchups_df['Week'].to_numpy(), 2),
+        'League': np.repeat(matchups_df['League'].to_numpy(), 2),
+        'Team Name': np.column_stack([home_teams, away_teams]).ravel(),
+        'Team Display': np.column_stack([home_displays, away_displays]).ravel(),
+        'Score': np.column_stack([matchups_df['Home Score'].to_numpy(),
+                                  matchups_df['Away Score'].to_numpy()]).ravel(),
+        'Opponent': np.column_stack([away_teams, home_teams]).ravel(),
+        'Opponent Display': np.column_stack([away_displays, home_displays]).ravel()
+    }, columns=columns)
+
+
+def _weekly_high_rows(matchups_df, played):
+    """Get {week: row of its high score in played}, only regrouping changed weeks of a patched matchups table"""
+    global _WEEKLY_HIGHS
+    version = matchups_df.attrs.get('matchups_version')
+    cached_version, cached_rows, high_rows = _WEEKLY_HIGHS
+    with _MATCHUP_LOCK:
+        table_version, table_rebuilt = _MATCHUP_TABLE['version'], _MATCHUP_TABLE['rebuilt']
+
+    if version is not None and len(matchups_df) == cached_rows:
+        if version == cached_version:
+            return high_rows
+        if version == cached_version + 1 and version == table_version and not table_rebuilt:
+            changed_weeks = matchups_df.loc[matchups_df['Changed'], 'Week'].unique()
+            high_rows = {week: row for week, row in high_rows.items() if week not in changed_weeks}
+            changed = played[played['Week'].isin(changed_weeks)]
+            high_rows.update(changed.groupby('Week')['Score'].idxmax().to_dict())
+            _WEEKLY_HIGHS = (version, len(matchups_df), high_rows)
+            return high_rows
+
+    high_rows = played.groupby('Week')['Score'].idxmax().to_dict()
+    if version is not None:
+        _WEEKLY_HIGHS = (version, len(matchups_df), high_rows)
+    return high_rows
+
+
+def summarize_high_scores(matchups_df):
+    """Get the weekly high scores and the season high score in one pass
+
+    Returns (weekly_highs, season_high): one row per week with a played score,
+    and the single best performance, which also earns the high score bonus.
+    Ties go to the performance that comes first in schedule order.
+    """
+    scores = build_team_week_scores(matchups_df)
+    played = scores[scores['Score'] > 0]
+    if played.empty:
+        return played, None
+
+    high_rows = _weekly_high_rows(matchups_df, played)
+    weekly_highs = played.loc[[high_rows[week] for week in sorted(high_rows)]].reset_index(drop=True)
+    season_high = played.loc[played['Score'].idxmax()]
+    return weekly_highs, season_high
+
+
+def seed_playoff_field(all_teams, playoff_slots=PLAYOFF_SLOTS, min_per_division=MIN_TEAMS_PER_DIVISION,
+                       division_winner_auto_bid=DIVISION_WINNER_AUTO_BID):
+    """Flag which teams of a (Wins, Points For)-sorted frame make the playoffs under the seeding rules"""
+    division_rank = all_teams.groupby('League', sort=False).cumcount().to_numpy()
+    return _qualify_seeds(division_rank, playoff_slots, min_per_division, division_winner_auto_bid)
+
+
+def _qualify_seeds(division_rank, playoff_slots, min_per_division, division_winner_auto_bid):
+    """Flag qualifiers given each seed's rank within its division, along the last axis (one row per trial)"""
+    # Division winners and the division minimum are guaranteed spots
+    guaranteed_per_division = max(min_per_division, 1 if division_winner_auto_bid else 0)
+    qualified = division_rank < guaranteed_per_division
+
+    # Remaining spots go to the best teams not already in
+    open_slots = np.maximum(playoff_slots - qualified.sum(axis=-1, keepdims=True), 0)
+    qualified |= ~qualified & (np.cumsum(~qualified, axis=-1) <= open_slots)
+    return qualified
+
+
+@timed()
+def calculate_playoff_standings(df, matchups_df=None, playoff_slots=PLAYOFF_SLOTS,
+                                min_per_division=MIN_TEAMS_PER_DIVISION,
+                                division_winner_auto_bid=DIVISION_WINNER_AUTO_BID,
+                                high_score_bonus=HIGH_SCORE_BONUS):
+    """Calculate playoff standings with division winner auto-bids, a per-division minimum and the high score bonus
+
+    Qualifying teams take the first playoff_slots seeds in (Wins, Points For) order,
+    followed by every other team in the same order.
+    """
     if df is None or df.empty:
         return None
 
     all_teams = df.copy()
 
     # Apply weekly high score bonus
-    if matchups_df is not None and not matchups_df.empty:
-        all_performances = []
-        for _, matchup in matchups_df.iterrows():
-            if matchup['Home Score'] > 0:
-                all_performances.append({
-                    'Team': matchup['Home Team'],
-                    'League': matchup['League'],
-                    'Score': matchup['Home Score']
-                })
-            if matchup['Away Score'] > 0:
-                all_performances.append({
-                    'Team': matchup['Away Team'],
-                    'League': matchup['League'],
-                    'Score': matchup['Away Score']
-                })
-
-        if all_performances:
-            highest_performance = max(all_performances, key=lambda x: x['Score'])
-            bonus_team = highest_performance['Team']
-            bonus_league = highest_performance['League']
-            mask = (all_teams['Name'] == bonus_team) & (all_teams['League'] == bonus_league)
-            all_teams.loc[mask, 'Wins'] = all_teams.loc[mask, 'Wins'] + 0.5
+    _, season_high = summarize_high_scores(matchups_df)
+    if season_high is not None and high_score_bonus:
+        mask = (all_teams['Name'] == season_high['Team Name']) & (all_teams['League'] == season_high['League'])
+        all_teams['Wins'] = all_teams['Wins'].astype(float)
+        all_teams.loc[mask, 'Wins'] = all_teams.loc[mask, 'Wins'] + high_score_bonus
 
     # Sort all teams by wins and points
     all_teams = all_teams.sort_values(by=['Wins', 'Points For'], ascending=[False, False]).reset_index(drop=True)
 
-    # Step 1: Identify league winners (top team from each league)
-    league_winners = {}
-    for league_name in LEAGUES.keys():
-        league_teams = all_teams[all_teams['League'] == league_name]
-        if not league_teams.empty:
-            league_winners[league_name] = league_teams.iloc[0]['Name']
-
-    # Step 2: Add all league winners first
-    playoff_teams = []
-    league_counts = {league: 0 for league in LEAGUES.keys()}
-
-    for _, team in all_teams.iterrows():
-        if team['Name'] in league_winners.values():
-            playoff_teams.append(team.to_dict())
-            league_counts[team['League']] += 1
-
-    # Step 3: Ensure minimum 2 teams per league
-    for league_name in LEAGUES.keys():
-        if league_counts[league_name] < 2:
-            # Find the next best team from this league that's not already in playoffs
-            league_teams = all_teams[all_teams['League'] == league_name]
-            for _, team in league_teams.iterrows():
-                # Check if team is already in playoffs
-                if any(p['Name'] == team['Name'] and p['League'] == team['League'] for p in playoff_teams):
-                    continue
-                # Add this team
-                playoff_teams.append(team.to_dict())
-                league_counts[league_name] += 1
-                if league_counts[league_name] >= 2:
-                    break
-
-    # Step 4: Fill remaining spots with best available teams (up to 8 total)
-    for _, team in all_teams.iterrows():
-        if len(playoff_teams) >= 8:
-            break
-        # Check if team is already in playoffs
-        if any(p['Name'] == team['Name'] and p['League'] == team['League'] for p in playoff_teams):
-            continue
-        # Add team
-        playoff_teams.append(team.to_dict())
-        league_counts[team['League']] += 1
+    qualified = seed_playoff_field(all_teams, playoff_slots, min_per_division, division_winner_auto_bid)
+    seed_order = np.argsort(~qualified, kind='stable')
 
-    # Create result dataframe with all teams
-    result_teams = []
-    for _, team in all_teams.iterrows():
-        team_dict = team.to_dict()
-        result_teams.append(team_dict)
-
-    result_df = pd.DataFrame(result_teams)
+    result_df = all_teams.iloc[seed_order].reset_index(drop=True)
     result_df['Rank'] = range(1, len(result_df) + 1)
-    result_df = result_df[['Rank', 'Name', 'League', 'Wins', 'Points For', 'Points Against', 'Streak']]
+    result_df = result_df[['Rank', 'Name', 'Team Display', 'League', 'Wins', 'Points For', 'Points Against', 'Streak']]
     return result_df
+
+
+# Memo of the last simulation (key, odds) and the odds pages read: the
+# result for data version 'version', counted in 'updates' as it changes
+_PLAYOFF_ODDS = {'key': None, 'odds': None, 'latest': None, 'version': None, 'updates': 0}
+_PLAYOFF_ODDS_LOCK = threading.Lock()
+
+
+def _season_inputs(leagues):
+    """Collect teams, completed weekly scores and remaining games from (league_name, League) pairs"""
+    teams, index, played, remaining = [], {}, [], []
+    for league_name, league in leagues:
+        for team in league.teams.values():
+            index[(league.id, team.id)] = len(teams)
+            teams.append((league_name, team.name, team.wins, team.points_for))
+    for league_name, league in leagues:
+        for matchup in league.schedule:
+            if matchup.away_id is None:
+                continue
+            home = index.get((league.id, matchup.home_id))
+            away = index.get((league.id, matchup.away_id))
+            if home is None or away is None:
+                continue
+            if matchup.week < league.current_week:
+                played.append((home, matchup.home_score))
+                played.append((away, matchup.away_score))
+            elif not matchup.playoff:
+                # Bracket games don't count toward seeding
+                remaining.append((home, away))
+    return teams, played, remaining
+
+
+def _simulate_seasons(division, wins, points_for, score_mean, score_std, home, away, season_high, trials,
+                      batch_scores, rng, playoff_slots, min_per_division, division_winner_auto_bid, high_score_bonus):
+    """Count the trials each team makes the playoffs, simulating every remaining game batch by batch"""
+    n_teams, n_games = len(wins), len(home)
+    slot_teams = np.concatenate([home, away])
+    n_slots = len(slot_teams)
+    # Seed positions grouped by division start at these offsets once sorted by (division, seed)
+    division_start = np.concatenate([[0], np.cumsum(np.bincount(division))[:-1]])
+    positions = np.arange(n_teams)
+    high_score, high_team = season_high
+    batch = max(batch_scores // max(n_slots, 1), 1)
+    # Flat (trial, team) cell of every simulated score, so a batch's totals are one bincount each
+    batch_cells = (np.arange(min(batch, trials))[:, None] * n_teams + slot_teams).ravel()
+
+    made = np.zeros(n_teams, dtype=np.int64)
+    for start in range(0, trials, batch):
+        size = min(batch, trials - start)
+        # float32 draws are plenty for fantasy scores and markedly faster to generate
+        scores = np.maximum(rng.standard_normal((size, n_slots), dtype=np.float32) * score_std[slot_teams]
+                            + score_mean[slot_teams], 0)
+        # 1 for a home win, 0 for an away win, 0.5 for a tie; away sides get the rest
+        home_result = (np.sign(scores[:, :n_games] - scores[:, n_games:]) + 1) * 0.5
+        slot_wins = np.concatenate([home_result, 1 - home_result], axis=1)
+
+        cells = batch_cells[:size * n_slots]
+        trial_wins = wins + np.bincount(cells, weights=slot_wins.ravel(), minlength=size * n_teams) \
+            .reshape(size, n_teams)
+        trial_points = points_for + np.bincount(cells, weights=scores.ravel(), minlength=size * n_teams) \
+            .reshape(size, n_teams)
+
+        if high_score_bonus:
+            # The season's single best score earns the bonus; the standing high keeps ties
+            bonus_team = np.full(size, high_team)
+            if n_games:
+                best_slot = scores.argmax(axis=1)
+                beaten = scores[np.arange(size), best_slot] > high_score
+                bonus_team[beaten] = slot_teams[best_slot[beaten]]
+            has_bonus = bonus_team >= 0
+            trial_wins[np.flatnonzero(has_bonus), bonus_team[has_bonus]] += high_score_bonus
+
+        # Seed order per trial: Wins, then Points For, both descending
+        order = np.lexsort((-trial_points, -trial_wins))
+        seeded_division = division[order]
+        # One sort by (division, seed) lines each division up in seed order
+        by_division = np.argsort(seeded_division * n_teams + positions, axis=1)
+        division_rank = np.empty_like(order)
+        np.put_along_axis(division_rank, by_division,
+                          positions - division_start[np.take_along_axis(seeded_division, by_division, axis=1)],
+                          axis=1)
+
+        qualified = _qualify_seeds(division_rank, playoff_slots, min_per_division, division_winner_auto_bid)
+        made += np.bincount(order[qualified], minlength=n_teams)
+    return made
+
+
+@timed()
+def simulate_playoff_odds(leagues, trials=PLAYOFF_SIM_TRIALS, seed=0, playoff_slots=PLAYOFF_SLOTS,
+                          min_per_division=MIN_TEAMS_PER_DIVISION,
+                          division_winner_auto_bid=DIVISION_WINNER_AUTO_BID,
+                          high_score_bonus=HIGH_SCORE_BONUS):
+    """Estimate each team's playoff odds by simulating the rest of the season under the seeding rules
+
+    leagues is a list of (league_name, League). Remaining scores are drawn
+    from a normal fit to each team's completed weeks, falling back to every
+    team's scores while a team has fewer than two. Returns a frame of League,
+    Name and Playoff % (0-100), reused until the inputs change.
+    """
+    teams, played, remaining = _season_inputs(leagues)
+    if not teams:
+        return None
+
+    names = [(league_name, name) for league_name, name, _, _ in teams]
+    division = pd.factorize(np.array([league_name for league_name, _ in names]))[0]
+    wins = np.array([team_wins for _, _, team_wins, _ in teams], dtype=float)
+    points_for = np.array([team_points for _, _, _, team_points in teams], dtype=float)
+    played = np.array(played, dtype=float).reshape(-1, 2)
+    played = played[played[:, 1] > 0]
+    remaining = np.array(remaining, dtype=np.int64).reshape(-1, 2)
+    if len(remaining) and len(played) < 2:
+        # Too few scores to fit a distribution yet
+        return None
+
+    key = (trials, seed, playoff_slots, min_per_division, division_winner_auto_bid, high_score_bonus, tuple(names),
+           wins.tobytes(), points_for.tobytes(), played.tobytes(), remaining.tobytes())
+    if _PLAYOFF_ODDS['key'] == key:
+        return _PLAYOFF_ODDS['odds'].copy()
+
+    owners, scores = played[:, 0].astype(np.int64), played[:, 1]
+    counts = np.bincount(owners, minlength=len(teams))
+    totals = np.bincount(owners, weights=scores, minlength=len(teams))
+    squares = np.bincount(owners, weights=scores ** 2, minlength=len(teams))
+    fitted = counts >= 2
+    score_mean = np.full(len(teams), scores.mean() if len(scores) else 0.0, dtype=np.float32)
+    score_std = np.full(len(teams), scores.std(ddof=1) if len(scores) >= 2 else 0.0, dtype=np.float32)
+    score_mean[fitted] = totals[fitted] / counts[fitted]
+    score_std[fitted] = np.sqrt(np.maximum(squares[fitted] - counts[fitted] * score_mean[fitted] ** 2, 0)
+                                / (counts[fitted] - 1))
+
+    season_high = (-np.inf, -1)
+    if len(scores):
+        # First occurrence in schedule order, as in summarize_high_scores
+        best = int(scores.argmax())
+        season_high = (scores[best], owners[best])
+
+    made = _simulate_seasons(division, wins, points_for, score_mean, score_std, remaining[:, 0], remaining[:, 1],
+                             season_high, trials, PLAYOFF_SIM_BATCH_SCORES, np.random.default_rng(seed), playoff_slots,
+                             min_per_division, division_winner_auto_bid, high_score_bonus)
+    odds = pd.DataFrame(names, columns=['League', 'Name'])
+    odds['Playoff %'] = made / trials * 100
+    _PLAYOFF_ODDS.update(key=key, odds=odds)
+    return odds.copy()
+
+
+def _update_playoff_odds():
+    try:
+        version = _DATA_VERSION
+        with _MERGE_LOCK:
+            leagues = [(league_name, _MERGED_LEAGUES[league_id][2]) for league_name, league_id in LEAGUES.items()
+                       if league_id in _MERGED_LEAGUES]
+        odds = simulate_playoff_odds(leagues)
+        latest = _PLAYOFF_ODDS['latest']
+        if (odds is None) != (latest is None) or (odds is not None and not odds.equals(latest)):
+            _PLAYOFF_ODDS['updates'] += 1
+        _PLAYOFF_ODDS.update(latest=odds, version=version)
+    finally:
+        _PLAYOFF_ODDS_LOCK.release()
+
+
+def update_playoff_odds():
+    """Re-simulate playoff odds from the latest leagues on a background thread if none is running"""
+    if _PLAYOFF_ODDS_LOCK.acquire(blocking=False):
+        threading.Thread(target=_update_playoff_odds, daemon=True).start()
+
+
+def get_playoff_odds():
+    """Get the latest simulated playoff odds, or None before the first run, without simulating on this thread
+
+    Data newer than the odds starts a background re-simulation; the data
+    version changes once it finishes so open pages pick it up.
+    """
+    if _PLAYOFF_ODDS['version'] != _DATA_VERSION:
+        update_playoff_odds()
+    odds = _PLAYOFF_ODDS['latest']
+    return None if odds is None else odds.copy()
@@ -0,0 +1,82 @@
+import glob
+import json
+import os
+import threading
+
+WEEK_STORE_DIR = "finalized_weeks"
+
+
+class FinalizedWeekStore:
+    """Schedule entries of matchup periods that are over, written once per season, league and week and never refetched
+
+    Each finalized week keeps its raw schedule entries (so merged payloads and
+    snapshots stay complete) and what parse(entry) made of them, so neither is
+    rebuilt on later refreshes.
+    """
+
+    def __init__(self, parse, directory=WEEK_STORE_DIR):
+        self.parse = parse
+        self.directory = directory
+        # (season, league_id) -> {week: (raw entries, parsed matchups)}
+        self._leagues = {}
+        # (season, league_id) -> (raw entries, parsed matchups) across all weeks, in week order
+        self._schedules = {}
+        self._lock = threading.Lock()
+
+    def _league_dir(self, season, league_id):
+        # League ids carry over between seasons, so the season is part of every key
+        return os.path.join(self.directory, str(season), str(league_id))
+
+    def _league(self, season, league_id):
+        """Get a league's finalized weeks for a season, reading them from disk on first use"""
+        weeks = self._leagues.get((season, league_id))
+        if weeks is None:
+            weeks = {}
+            for path in glob.glob(os.path.join(self._league_dir(season, league_id), "*.json")):
+                try:
+                    with open(path, 'r') as f:
+                        entries = json.load(f)
+                    week = int(os.path.basename(path)[:-len(".json")])
+                except (OSError, ValueError):
+                    # A damaged week is simply fetched and saved again
+                    continue
+                weeks[week] = (entries, [self.parse(entry) for entry in entries])
+            self._leagues[(season, league_id)] = weeks
+        return weeks
+
+    def weeks(self, season, league_id):
+        """Get the set of a league's finalized weeks in a season"""
+        with self._lock:
+            return set(self._league(season, league_id))
+
+    def schedule(self, season, league_id):
+        """Get a league's finalized (raw entries, matchups) for a season in week order"""
+        with self._lock:
+            schedule = self._schedules.get((season, league_id))
+            if schedule is None:
+                weeks = self._league(season, league_id)
+                ordered = [weeks[week] for week in sorted(weeks)]
+                schedule = ([entry for entries, _ in ordered for entry in entries],
+                            [matchup for _, matchups in ordered for matchup in matchups])
+                self._schedules[(season, league_id)] = schedule
+        return schedule
+
+    def finalize(self, season, league_id, week, entries):
+        """Save a finished week's schedule entries unless that week is already saved"""
+        with self._lock:
+            weeks = self._league(season, league_id)
+            if week in weeks:
+                return
+            weeks[week] = (entries, [self.parse(entry) for entry in entries])
+            self._schedules.pop((season, league_id), None)
+
+        path = os.path.join(self._league_dir(season, league_id), f"{week}.json")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError:
+            # Still final in memory; it is saved on the next process's first fetch
+            pass